@@ -0,0 +1,128 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+from typing import Any, Dict, NamedTuple, Optional
+
+from fastapi import Request, Response
+from fastapi.staticfiles import StaticFiles
+from starlette.types import Receive, Scope, Send
+
+from http_cache import accepts_encoding, is_not_modified
+
+# Fingerprinted URLs never change content, so browsers may keep them for a year
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "image/svg+xml")
+
+
+def _brotli_compress(body: bytes) -> Optional[bytes]:
+    # Optional dependency: without it only gzip variants are built
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli.compress(body, quality=11)
+
+
+class StaticAsset(NamedTuple):
+    media_type: str
+    digest: str
+    # Content-Encoding ("" for identity) -> body, best encoding first
+    variants: Dict[str, bytes]
+
+
+class StaticAssets:
+    """Content-fingerprinted static files served from memory with precompressed variants.
+
+    ``build`` reads every file under ``directory`` once, names it
+    ``<name>.<hash><ext>`` and compresses text assets with brotli (if installed)
+    and gzip. Templates link to those names through ``url``; they are served with
+    ``Cache-Control: immutable`` in the best encoding the client accepts. Any other
+    path falls through to plain StaticFiles.
+    """
+
+    def __init__(self, directory: str, url_prefix: str = "/static", min_compress_size: int = 256):
+        self.directory = directory
+        self.url_prefix = url_prefix.rstrip("/")
+        self.min_compress_size = min_compress_size
+        self._fallback = StaticFiles(directory=directory)
+        # Source path -> fingerprinted name, and fingerprinted name -> asset
+        self._names: Dict[str, str] = {}
+        self._assets: Dict[str, StaticAsset] = {}
+
+    def build(self) -> int:
+        """Fingerprint and compress every file; returns how many were built"""
+        names: Dict[str, str] = {}
+        assets: Dict[str, StaticAsset] = {}
+        for root, _, files in os.walk(self.directory):
+            for filename in files:
+                full_path = os.path.join(root, filename)
+                path = os.path.relpath(full_path, self.directory).replace(os.sep, "/")
+                with open(full_path, "rb") as f:
+                    body = f.read()
+
+                digest = hashlib.sha256(body).hexdigest()[:12]
+                stem, ext = os.path.splitext(path)
+                fingerprinted = f"{stem}.{digest}{ext}"
+                media_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+
+                variants: Dict[str, bytes] = {}
+                if len(body) >= self.min_compress_size and media_type.startswith(COMPRESSIBLE_TYPES):
+                    brotli_body = _brotli_compress(body)
+                    if brotli_body is not None:
+                        variants["br"] = brotli_body
+                    # mtime=0 keeps the bytes, and so the ETag, identical across restarts
+                    variants["gzip"] = gzip.compress(body, compresslevel=9, mtime=0)
+                variants[""] = body
+
+                names[path] = fingerprinted
+                assets[fingerprinted] = StaticAsset(media_type, digest, variants)
+        self._names = names
+        self._assets = assets
+        return len(assets)
+
+    def url(self, path: str) -> str:
+        """Fingerprinted URL for ``path`` (relative to the static directory)"""
+        path = path.lstrip("/")
+        return f"{self.url_prefix}/{self._names.get(path, path)}"
+
+    def manifest(self) -> Dict[str, Dict[str, Any]]:
+        """Each source path's URL and byte size per encoding"""
+        return {
+            path: {
+                "url": f"{self.url_prefix}/{name}",
+                "sizes": {encoding or "identity": len(body) for encoding, body in self._assets[name].variants.items()},
+            }
+            for path, name in self._names.items()
+        }
+
+    def _encoding_for(self, request: Request, asset: StaticAsset) -> str:
+        for encoding in asset.variants:
+            if not encoding or accepts_encoding(request, encoding):
+                return encoding
+        return ""
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        asset = self._assets.get(scope["path"].lstrip("/"))
+        if asset is None or scope["method"] not in ("GET", "HEAD"):
+            await self._fallback(scope, receive, send)
+            return
+
+        request = Request(scope)
+        encoding = self._encoding_for(request, asset)
+        body = asset.variants[encoding]
+        etag = f'"{asset.digest}-{encoding}"' if encoding else f'"{asset.digest}"'
+        headers = {"Cache-Control": IMMUTABLE_CACHE_CONTROL, "ETag": etag}
+        if len(asset.variants) > 1:
+            headers["Vary"] = "Accept-Encoding"
+
+        if is_not_modified(request, etag, None):
+            response = Response(status_code=304, headers=headers)
+        else:
+            if encoding:
+                headers["Content-Encoding"] = encoding
+            content = b"" if scope["method"] == "HEAD" else body
+            response = Response(content=content, media_type=asset.media_type, headers=headers)
+            if scope["method"] == "HEAD":
+                response.headers["Content-Length"] = str(len(body))
+        await response(scope, receive, send)
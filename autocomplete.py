@@ -0,0 +1,70 @@
+import sys
+from bisect import bisect_left
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+
+class CatalogEntry(NamedTuple):
+    name: str
+    kind: str
+    # (role, category) pairs for skills; empty for roles
+    contexts: Tuple[Tuple[str, str], ...]
+
+
+class CatalogAutocomplete:
+    """Prefix search over skill and role names using sorted key arrays and bisect.
+
+    Names are matched on their start first, then on the start of any later word
+    ("spark" finds "Apache Spark"). Keys are casefolded and strings interned, so
+    memory stays linear in the number of distinct names. Rebuilt by CatalogCache
+    only when the catalog version changes.
+    """
+
+    def __init__(self, max_contexts: int = 5):
+        self.max_contexts = max_contexts
+        self.version: Optional[str] = None
+        self._entries: List[CatalogEntry] = []
+        self._name_keys: List[str] = []
+        self._name_ids: List[int] = []
+        self._word_keys: List[str] = []
+        self._word_ids: List[int] = []
+
+    def on_catalog_change(self, version: str, roles: List[str], rows: List[Tuple[str, str, str]]) -> None:
+        contexts: Dict[str, List[Tuple[str, str]]] = {}
+        for role, category, name in rows:
+            contexts.setdefault(sys.intern(name), []).append((sys.intern(role), sys.intern(category)))
+
+        entries = [CatalogEntry(name, "skill", tuple(pairs)) for name, pairs in contexts.items()]
+        entries += [CatalogEntry(sys.intern(role), "role", ()) for role in roles]
+
+        name_keys: List[Tuple[str, int]] = []
+        word_keys: List[Tuple[str, int]] = []
+        for entry_id, entry in enumerate(entries):
+            words = entry.name.casefold().split()
+            name_keys.append((" ".join(words), entry_id))
+            word_keys.extend((" ".join(words[i:]), entry_id) for i in range(1, len(words)))
+        name_keys.sort()
+        word_keys.sort()
+
+        self._entries = entries
+        self._name_keys = [key for key, _ in name_keys]
+        self._name_ids = [entry_id for _, entry_id in name_keys]
+        self._word_keys = [key for key, _ in word_keys]
+        self._word_ids = [entry_id for _, entry_id in word_keys]
+        self.version = version
+
+    def search(self, prefix: str, limit: int = 10, kind: Optional[str] = None) -> List[CatalogEntry]:
+        prefix = " ".join(prefix.casefold().split())
+        if not prefix:
+            return []
+        found: Dict[int, None] = {}
+        for keys, ids in ((self._name_keys, self._name_ids), (self._word_keys, self._word_ids)):
+            position = bisect_left(keys, prefix)
+            while position < len(keys) and len(found) < limit and keys[position].startswith(prefix):
+                entry_id = ids[position]
+                if kind is None or self._entries[entry_id].kind == kind:
+                    found[entry_id] = None
+                position += 1
+        return [self._entries[entry_id] for entry_id in found]
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._entries), "keys": len(self._name_keys) + len(self._word_keys)}
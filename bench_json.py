@@ -0,0 +1,68 @@
+"""Compare FastAPI's default JSON path with FastJSONResponse on catalog-sized payloads.
+
+Usage:
+    python bench_json.py --roles 50 --categories 8 --skills 25 --repeat 200
+
+The default path is what FastAPI does with a returned dict: jsonable_encoder over
+it, then JSONResponse.render. The fast path is what the hot API endpoints do by
+returning a FastJSONResponse, which renders the dict directly.
+"""
+import argparse
+import sys
+import timeit
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+import fast_json
+from fast_json import FastJSONResponse
+
+
+def catalog(roles: int, categories: int, skills: int) -> dict:
+    return {
+        "skills": {
+            f"Role {r}": {
+                f"Category {c}": [f"Skill {r}-{c}-{s}" for s in range(skills)]
+                for c in range(categories)
+            }
+            for r in range(roles)
+        }
+    }
+
+
+def default_path(content: dict) -> bytes:
+    return JSONResponse(jsonable_encoder(content)).body
+
+
+def fast_path(content: dict) -> bytes:
+    return FastJSONResponse(content).body
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--roles", type=int, default=50)
+    parser.add_argument("--categories", type=int, default=8)
+    parser.add_argument("--skills", type=int, default=25)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    payloads = {
+        "one role": catalog(1, args.categories, args.skills),
+        "full catalog": catalog(args.roles, args.categories, args.skills),
+    }
+    encoder = "orjson" if fast_json.orjson is not None else "json (orjson not installed)"
+    print(f"fast path encoder: {encoder}")
+    for name, content in payloads.items():
+        assert FastJSONResponse(content).body == JSONResponse(content).body
+        size = len(fast_path(content))
+        default = min(timeit.repeat(lambda: default_path(content), number=args.repeat, repeat=5)) / args.repeat
+        fast = min(timeit.repeat(lambda: fast_path(content), number=args.repeat, repeat=5)) / args.repeat
+        print(
+            f"{name:>12}: {size:>9} bytes  default {default * 1e6:9.1f} us  "
+            f"fast {fast * 1e6:9.1f} us  {default / fast:5.1f}x"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
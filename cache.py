@@ -0,0 +1,144 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, Hashable, List, Optional, Protocol, Sequence, Tuple
+
+MISSING = object()
+
+
+class LRUCache:
+    """Bounded LRU cache with an optional per-entry time-to-live"""
+
+    def __init__(self, max_entries: int = 1024, ttl: Optional[float] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl or None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = MISSING) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            stored_at, value = entry
+            if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                self.evictions += 1
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+def catalog_version(roles: List[str], rows: List[Tuple[str, str, str]]) -> str:
+    """Content digest of the catalog; equal catalogs get equal versions in every process"""
+    payload = json.dumps([roles, rows], separators=(",", ":")).encode()
+    return hashlib.sha256(payload).hexdigest()[:16]
+
+
+class CatalogListener(Protocol):
+    def on_catalog_change(self, version: str, roles: List[str], rows: List[Tuple[str, str, str]]) -> None:
+        ...
+
+
+class CatalogCache:
+    """Job role and skill lookups, valid for a single catalog version"""
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: Optional[float] = None,
+        listeners: Sequence[CatalogListener] = (),
+    ):
+        self.version: Optional[str] = None
+        self.updated_at: Optional[datetime] = None
+        # Why the most recent refresh failed; cleared by the next successful load
+        self.last_error: Optional[str] = None
+        self.last_error_at: Optional[datetime] = None
+        self._entries = LRUCache(max_entries=max_entries, ttl=ttl)
+        self._listeners = list(listeners)
+
+    def get(self, key: Hashable, default: Any = MISSING) -> Any:
+        return self._entries.get(key, default)
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._entries.set(key, value)
+
+    def load(self, roles: List[str], rows: List[Tuple[str, str, str]]) -> bool:
+        """Warm the cache from the full catalog, ordered by (role, category, name).
+
+        Entries are re-set on every call, so periodic refreshes keep them warm past
+        the TTL. Other entries are dropped, and listeners rebuild their derived
+        state, only when the catalog version changes. Returns True if it did.
+        """
+        version = catalog_version(roles, rows)
+        changed = version != self.version
+
+        skills_by_role: Dict[str, Dict[str, List[str]]] = {role: {} for role in roles}
+        for role, category, name in rows:
+            skills_by_role.setdefault(role, {}).setdefault(category, []).append(name)
+
+        if changed:
+            self._entries.clear()
+            self.version = version
+            self.updated_at = datetime.now(timezone.utc)
+        self.set(("roles",), list(roles))
+        for role, skills in skills_by_role.items():
+            self.set(("skills", role), skills)
+        if changed:
+            for listener in self._listeners:
+                listener.on_catalog_change(version, roles, rows)
+        self.last_error = None
+        self.last_error_at = None
+        return changed
+
+    def record_error(self, error: BaseException) -> None:
+        self.last_error = f"{type(error).__name__}: {error}"
+        self.last_error_at = datetime.now(timezone.utc)
+
+    def invalidate(self) -> None:
+        self._entries.clear()
+        self.version = None
+        self.updated_at = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+            "last_error": self.last_error,
+            "last_error_at": self.last_error_at.isoformat() if self.last_error_at else None,
+            **self._entries.stats(),
+        }
@@ -0,0 +1,135 @@
+import gzip
+import threading
+import time
+from typing import Any, Dict, Optional, Sequence
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from cache import LRUCache, MISSING
+from http_cache import accepts_gzip
+
+COMPRESSIBLE_TYPES = (
+    "text/html",
+    "text/css",
+    "text/plain",
+    "text/javascript",
+    "application/javascript",
+    "application/json",
+    "image/svg+xml",
+)
+
+
+class CompressedBodyCache:
+    """Gzips response bodies once per key, and counts what compression costs and saves"""
+
+    def __init__(self, max_entries: int = 256, compresslevel: int = 6):
+        self.compresslevel = compresslevel
+        self._bodies = LRUCache(max_entries=max_entries)
+        self._lock = threading.Lock()
+        self.responses = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.compress_seconds = 0.0
+
+    def compress(self, key: Optional[Any], body: bytes) -> bytes:
+        """Gzip ``body``, reusing the result stored under ``key``; a None key is compressed without caching"""
+        compressed = MISSING if key is None else self._bodies.get(key)
+        if compressed is MISSING:
+            started = time.perf_counter()
+            # mtime=0 so equal bodies always compress to equal bytes
+            compressed = gzip.compress(body, compresslevel=self.compresslevel, mtime=0)
+            elapsed = time.perf_counter() - started
+            if key is not None:
+                self._bodies.set(key, compressed)
+            with self._lock:
+                self.compress_seconds += elapsed
+        with self._lock:
+            self.responses += 1
+            self.bytes_in += len(body)
+            self.bytes_out += len(compressed)
+        return compressed
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "responses": self.responses,
+                "bytes_in": self.bytes_in,
+                "bytes_out": self.bytes_out,
+                "ratio": self.bytes_in / self.bytes_out if self.bytes_out else None,
+                "compress_ms_total": self.compress_seconds * 1000,
+                "cache": self._bodies.stats(),
+            }
+
+
+class CompressionMiddleware:
+    """Gzips complete responses of allowlisted content types above ``minimum_size``.
+
+    Bodies of responses with a strong ETag (the shared catalog and snapshot
+    responses) are memoized by it, so each is compressed once. Others, such as
+    personalized pages, are compressed per request without filling the cache.
+    Responses that already carry a Content-Encoding, and streamed responses,
+    pass through untouched.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        body_cache: CompressedBodyCache,
+        minimum_size: int = 500,
+        content_types: Sequence[str] = COMPRESSIBLE_TYPES,
+    ):
+        self.app = app
+        self.body_cache = body_cache
+        self.minimum_size = minimum_size
+        self.content_types = tuple(content_types)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not accepts_gzip(Request(scope)):
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[Message] = None
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start_message, passthrough
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                content_type = headers.get("content-type", "").split(";")[0].strip().lower()
+                if "content-encoding" in headers or content_type not in self.content_types:
+                    passthrough = True
+                    await send(message)
+                else:
+                    # Held until the body shows whether compression applies
+                    start_message = message
+                return
+
+            body = message.get("body", b"")
+            if message.get("more_body", False) or len(body) < self.minimum_size:
+                # Streamed or small: send as-is
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            headers = MutableHeaders(scope=start_message)
+            etag = headers.get("etag")
+            strong_etag = etag and not etag.startswith("W/")
+            compressed = self.body_cache.compress(etag if strong_etag else None, body)
+
+            headers["Content-Encoding"] = "gzip"
+            headers["Content-Length"] = str(len(compressed))
+            headers.add_vary_header("Accept-Encoding")
+            if strong_etag:
+                # The gzip bytes differ from the identity body, so the validator becomes weak
+                headers["ETag"] = "W/" + etag
+            await send(start_message)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_wrapper)
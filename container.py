@@ -1,79 +1,390 @@
 from dependency_injector import containers, providers
 from dependency_injector.wiring import Provide, inject
+from sqlalchemy import select, insert, update, delete, union, func
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import Protocol, Optional, Dict, List
+from typing import Protocol, NamedTuple, Optional, AsyncIterator, Dict, List, Sequence, Set, Tuple
+from datetime import datetime
+import asyncio
+from itertools import groupby
+from operator import itemgetter
 
-from database import get_db, User, JobRole, Skill
+from database import User, JobRole, Skill, user_skills
+from cache import CatalogCache, MISSING
+from hashing import PasswordHasher, HashingBusyError, default_workers
+from snapshot import CatalogSnapshotStore
+from ratelimit import RateLimiter, MemoryRateLimitBackend, RedisRateLimitBackend
+from sessions import MemorySessionBackend, SQLiteSessionBackend, RedisSessionBackend
+from skill_index import SkillIndex, SkillSelectionListener
+from cooccurrence import SkillCooccurrence
+from recommend import RoleRecommender
+from autocomplete import CatalogAutocomplete
+from fuzzy import FuzzySkillSearch
 
 
 # Repository Protocols
+# The sync layer only backs offline tools (import_users.py); routes use the async services
 class UserRepositoryProtocol(Protocol):
-    def get_by_userid(self, userid: str, db: Session) -> Optional[User]:
+    def get_existing_userids(self, userids: List[str], db: Session) -> Set[str]:
         ...
     
-    def create(self, user: User, db: Session) -> bool:
+    def bulk_create(self, rows: List[Dict[str, str]], db: Session) -> int:
+        ...
+
+
+# Service Protocols
+class UserServiceProtocol(Protocol):
+    def import_users(self, rows: List[Dict[str, str]], db: Session) -> Tuple[int, List[str]]:
+        ...
+
+
+# Async Repository Protocols
+class AsyncUserRepositoryProtocol(Protocol):
+    async def get_by_userid(self, userid: str, db: AsyncSession) -> Optional[User]:
         ...
     
-    def authenticate(self, userid: str, password_hash: str, phone: str, db: Session) -> Optional[User]:
+    async def create(self, user: User, db: AsyncSession) -> bool:
+        ...
+    
+    async def update_password(self, user: User, password_hash: str, db: AsyncSession) -> None:
         ...
 
 
-class SkillRepositoryProtocol(Protocol):
-    def get_all_job_roles(self, db: Session) -> List[JobRole]:
+class AsyncSkillRepositoryProtocol(Protocol):
+    async def get_all_job_roles(self, db: AsyncSession) -> List[JobRole]:
+        ...
+    
+    async def get_skill_rows_by_role(self, role_name: str, db: AsyncSession) -> List[Tuple[str, str]]:
         ...
     
-    def get_skills_by_role(self, role_name: str, db: Session) -> Optional[JobRole]:
+    async def get_skill_rows_by_roles(self, role_names: List[str], db: AsyncSession) -> List[Tuple[str, str, str]]:
+        ...
+    
+    async def get_catalog_rows(self, db: AsyncSession) -> List[Tuple[str, str, str]]:
         ...
 
 
-# Service Protocols
-class UserServiceProtocol(Protocol):
-    def authenticate(self, userid: str, password: str, phone: str, db: Session) -> Optional[User]:
+class AsyncUserSkillRepositoryProtocol(Protocol):
+    async def get_selection(self, user_id: int, db: AsyncSession) -> Tuple[Optional[str], Dict[int, str]]:
+        ...
+    
+    async def resolve_skill_ids(self, names: List[str], job_role: Optional[str], db: AsyncSession) -> Dict[str, int]:
+        ...
+    
+    async def apply_selection(
+        self, user_id: int, job_role: Optional[str], add_ids: List[int], remove_ids: List[int], db: AsyncSession
+    ) -> None:
+        ...
+    
+    async def search_users_by_skills(
+        self, names: List[str], match_all: bool, after: int, limit: int, db: AsyncSession
+    ) -> List["UserSummary"]:
+        ...
+    
+    def stream_user_skill_names(self, db: AsyncSession) -> AsyncIterator[List[Tuple[int, str]]]:
+        ...
+    
+    async def get_user_summaries(self, user_ids: List[int], db: AsyncSession) -> Dict[int, "UserSummary"]:
+        ...
+
+
+# Async Service Protocols
+class AsyncUserServiceProtocol(Protocol):
+    async def authenticate(self, userid: str, password: str, phone: str, db: AsyncSession) -> Optional[User]:
+        ...
+    
+    async def create_user(self, name: str, userid: str, password: str, phone: str, db: AsyncSession) -> bool:
+        ...
+    
+    async def get_user_by_userid(self, userid: str, db: AsyncSession) -> Optional[User]:
+        ...
+
+
+class AsyncSkillServiceProtocol(Protocol):
+    async def get_job_roles(self, db: AsyncSession) -> List[str]:
+        ...
+    
+    async def get_skills_for_role(self, role: str, db: AsyncSession) -> Dict[str, List[str]]:
+        ...
+    
+    async def get_skills_for_roles(self, roles: Optional[List[str]], db: AsyncSession) -> Dict[str, Dict[str, List[str]]]:
+        ...
+    
+    async def refresh_catalog(self, db: AsyncSession) -> bool:
+        ...
+    
+    @property
+    def catalog_version(self) -> Optional[str]:
+        ...
+    
+    @property
+    def catalog_updated_at(self) -> Optional[datetime]:
+        ...
+
+
+class AsyncUserSkillServiceProtocol(Protocol):
+    async def get_selection(self, user_id: int, db: AsyncSession) -> Tuple[Optional[str], List[str]]:
         ...
     
-    def create_user(self, name: str, userid: str, password: str, phone: str, db: Session) -> bool:
+    async def save_selection(
+        self, user_id: int, job_role: Optional[str], skill_names: List[str], db: AsyncSession
+    ) -> "SkillSelectionChange":
         ...
     
-    def get_user_by_userid(self, userid: str, db: Session) -> Optional[User]:
+    async def search_users(
+        self, skill_names: List[str], match_all: bool, after: int, limit: int, db: AsyncSession
+    ) -> Tuple[List["UserSummary"], Optional[int]]:
         ...
 
 
-class SkillServiceProtocol(Protocol):
-    def get_job_roles(self, db: Session) -> List[str]:
+class AsyncSkillMatchServiceProtocol(Protocol):
+    async def rebuild_index(self, db: AsyncSession) -> None:
+        ...
+    
+    async def load_cooccurrence(self, db: AsyncSession) -> None:
+        ...
+    
+    async def match(
+        self, skill_names: List[str], min_overlap: int, limit: int, db: AsyncSession
+    ) -> Tuple[List[Tuple["UserSummary", int]], int]:
         ...
     
-    def get_skills_for_role(self, role: str, db: Session) -> Dict[str, List[str]]:
+    def related_skills(self, skill_names: List[str], limit: int) -> List[Tuple[str, int]]:
         ...
 
 
+class UserSummary(NamedTuple):
+    # No userid: it is the login identifier, and summaries are shown to other users
+    id: int
+    name: str
+    job_role: Optional[str]
+
+
+class SkillSelectionChange(NamedTuple):
+    job_role: Optional[str]
+    skills: List[str]
+    added: List[str]
+    removed: List[str]
+
+
+# Shared Queries
+def skill_rows_by_role_query(role_name: str):
+    # One joined query, ordered to match the skills(job_role_id, category, name) index
+    return (
+        select(Skill.category, Skill.name)
+        .join(JobRole, Skill.job_role_id == JobRole.id)
+        .where(JobRole.name == role_name)
+        .order_by(Skill.category, Skill.name)
+    )
+
+
+def insert_skipping_duplicates(table, index_elements: List[str], dialect: str):
+    """INSERT that skips rows conflicting on ``index_elements``; any other error still raises"""
+    if dialect == "mysql":
+        # A no-op update instead of INSERT IGNORE, which would also hide truncated values
+        column = table.c[index_elements[0]]
+        return mysql_insert(table).on_duplicate_key_update({column.name: column})
+    if dialect == "sqlite":
+        return sqlite_insert(table).on_conflict_do_nothing(index_elements=index_elements)
+    return insert(table)
+
+
+def group_skill_rows(rows: List[Tuple[str, str]]) -> Dict[str, List[str]]:
+    # Rows arrive ordered by category, so consecutive rows form each group
+    return {
+        category: [name for _, name in group]
+        for category, group in groupby(rows, key=itemgetter(0))
+    }
+
+
 # Repository Implementations
 class UserRepository:
-    def get_by_userid(self, userid: str, db: Session) -> Optional[User]:
-        return db.query(User).filter(User.userid == userid).first()
+    def get_existing_userids(self, userids: List[str], db: Session) -> Set[str]:
+        return set(db.scalars(select(User.userid).where(User.userid.in_(userids))))
     
-    def create(self, user: User, db: Session) -> bool:
+    def bulk_create(self, rows: List[Dict[str, str]], db: Session) -> int:
+        # One executemany; only a conflict on users.userid skips a row, any other error still raises
+        statement = insert_skipping_duplicates(User.__table__, ["userid"], db.get_bind().dialect.name)
+        result = db.execute(statement, rows)
+        db.commit()
+        return result.rowcount
+
+
+# Async Repository Implementations
+class AsyncUserRepository:
+    async def get_by_userid(self, userid: str, db: AsyncSession) -> Optional[User]:
+        result = await db.execute(select(User).where(User.userid == userid))
+        return result.scalars().first()
+    
+    async def create(self, user: User, db: AsyncSession) -> bool:
+        # A single INSERT; the unique index on users.userid rejects duplicates
         try:
             db.add(user)
-            db.commit()
+            await db.commit()
             return True
-        except Exception as e:
-            db.rollback()
+        except IntegrityError:
+            await db.rollback()
             return False
     
-    def authenticate(self, userid: str, password_hash: str, phone: str, db: Session) -> Optional[User]:
-        return db.query(User).filter(
-            User.userid == userid,
-            User.password == password_hash,
-            User.phone == phone
-        ).first()
+    async def update_password(self, user: User, password_hash: str, db: AsyncSession) -> None:
+        user.password = password_hash
+        await db.commit()
+
+
+class AsyncSkillRepository:
+    async def get_all_job_roles(self, db: AsyncSession) -> List[JobRole]:
+        result = await db.execute(select(JobRole).order_by(JobRole.id))
+        return list(result.scalars().all())
+    
+    async def get_skill_rows_by_role(self, role_name: str, db: AsyncSession) -> List[Tuple[str, str]]:
+        result = await db.execute(skill_rows_by_role_query(role_name))
+        return [tuple(row) for row in result]
+    
+    async def get_skill_rows_by_roles(self, role_names: List[str], db: AsyncSession) -> List[Tuple[str, str, str]]:
+        result = await db.execute(
+            select(JobRole.name, Skill.category, Skill.name)
+            .join(JobRole, Skill.job_role_id == JobRole.id)
+            .where(JobRole.name.in_(role_names))
+            .order_by(JobRole.name, Skill.category, Skill.name)
+        )
+        return [tuple(row) for row in result]
+    
+    async def get_catalog_rows(self, db: AsyncSession) -> List[Tuple[str, str, str]]:
+        result = await db.execute(
+            select(JobRole.name, Skill.category, Skill.name)
+            .join(JobRole, Skill.job_role_id == JobRole.id)
+            .order_by(JobRole.name, Skill.category, Skill.name)
+        )
+        return [tuple(row) for row in result]
 
 
-class SkillRepository:
-    def get_all_job_roles(self, db: Session) -> List[JobRole]:
-        return db.query(JobRole).all()
+class AsyncUserSkillRepository:
+    # Postings counted per skill when picking the rarest one to drive a match-all page
+    rarity_probe_limit = 1000
+    # Rows fetched per round trip when streaming user_skills for a rebuild
+    stream_batch_size = 10000
     
-    def get_skills_by_role(self, role_name: str, db: Session) -> Optional[JobRole]:
-        return db.query(JobRole).filter(JobRole.name == role_name).first()
+    async def get_selection(self, user_id: int, db: AsyncSession) -> Tuple[Optional[str], Dict[int, str]]:
+        job_role = await db.scalar(select(User.job_role).where(User.id == user_id))
+        result = await db.execute(
+            select(Skill.id, Skill.name)
+            .join(user_skills, user_skills.c.skill_id == Skill.id)
+            .where(user_skills.c.user_id == user_id)
+        )
+        return job_role, {skill_id: name for skill_id, name in result}
+    
+    async def resolve_skill_ids(self, names: List[str], job_role: Optional[str], db: AsyncSession) -> Dict[str, int]:
+        # Skill names repeat across roles; prefer the row under the chosen role, else the oldest
+        result = await db.execute(
+            select(Skill.id, Skill.name, JobRole.name)
+            .join(JobRole, Skill.job_role_id == JobRole.id)
+            .where(Skill.name.in_(names))
+            .order_by(Skill.id)
+        )
+        skill_ids: Dict[str, int] = {}
+        for skill_id, name, role_name in result:
+            if name not in skill_ids or role_name == job_role:
+                skill_ids[name] = skill_id
+        return skill_ids
+    
+    async def apply_selection(
+        self, user_id: int, job_role: Optional[str], add_ids: List[int], remove_ids: List[int], db: AsyncSession
+    ) -> None:
+        await db.execute(update(User).where(User.id == user_id).values(job_role=job_role))
+        if remove_ids:
+            await db.execute(
+                delete(user_skills)
+                .where(user_skills.c.user_id == user_id, user_skills.c.skill_id.in_(remove_ids))
+            )
+        if add_ids:
+            # Overlapping saves for one user can compute the same additions
+            await db.execute(
+                insert_skipping_duplicates(user_skills, ["user_id", "skill_id"], db.bind.dialect.name),
+                [{"user_id": user_id, "skill_id": skill_id} for skill_id in add_ids]
+            )
+        await db.commit()
+    
+    async def search_users_by_skills(
+        self, names: List[str], match_all: bool, after: int, limit: int, db: AsyncSession
+    ) -> List[UserSummary]:
+        """One keyset page of users having all (or any) of the named skills, ordered by user id"""
+        result = await db.execute(select(Skill.id, Skill.name).where(Skill.name.in_(names)))
+        skill_names = dict(result.all())
+        if not skill_names or (match_all and len(set(skill_names.values())) < len(set(names))):
+            return []
+        
+        if match_all:
+            # A skill name can map to one row per role, so each name stands for a set of skill ids
+            ids_by_name: Dict[str, List[int]] = {}
+            for skill_id, name in skill_names.items():
+                ids_by_name.setdefault(name, []).append(skill_id)
+            # Capped counts are enough to rank the names without reading whole posting lists
+            counts = await db.execute(select(*[
+                select(func.count()).select_from(
+                    select(user_skills.c.user_id)
+                    .where(user_skills.c.skill_id.in_(ids), user_skills.c.user_id > after)
+                    .limit(self.rarity_probe_limit)
+                    .subquery()
+                ).scalar_subquery()
+                for ids in ids_by_name.values()
+            ]))
+            rarest, *rest = [ids for _, ids in sorted(zip(counts.one(), ids_by_name.values()), key=itemgetter(0))]
+            
+            # Only the rarest name's skill ids drive the page; the other names are probed per candidate
+            others = []
+            for ids in rest:
+                other = user_skills.alias()
+                others.append(
+                    select(other.c.user_id)
+                    .where(other.c.user_id == user_skills.c.user_id, other.c.skill_id.in_(ids))
+                    .exists()
+                )
+            page_ids = rarest
+        else:
+            others = []
+            page_ids = list(skill_names)
+        
+        # Each skill id contributes at most `limit` matching rows from its (skill_id, user_id) index
+        # range, so every range stops at the page size and the cost does not grow with page depth
+        per_skill = [
+            select(
+                select(user_skills.c.user_id)
+                .where(user_skills.c.skill_id == skill_id, user_skills.c.user_id > after, *others)
+                .order_by(user_skills.c.user_id)
+                .limit(limit)
+                .subquery()
+                .c.user_id
+            )
+            for skill_id in page_ids
+        ]
+        # UNION also drops users holding a name under several roles twice
+        candidates = union(*per_skill).subquery()
+        page = select(candidates.c.user_id).order_by(candidates.c.user_id).limit(limit).subquery()
+        result = await db.execute(
+            select(User.id, User.name, User.job_role)
+            .join(page, page.c.user_id == User.id)
+            .order_by(User.id)
+        )
+        return [UserSummary(*row) for row in result]
+    
+    async def stream_user_skill_names(self, db: AsyncSession) -> AsyncIterator[List[Tuple[int, str]]]:
+        # Server-side cursor: only one batch of rows is held at a time
+        result = await db.stream(
+            select(user_skills.c.user_id, Skill.name)
+            .join(Skill, Skill.id == user_skills.c.skill_id)
+            .execution_options(yield_per=self.stream_batch_size)
+        )
+        async for rows in result.partitions():
+            yield rows
+    
+    async def get_user_summaries(self, user_ids: List[int], db: AsyncSession) -> Dict[int, UserSummary]:
+        result = await db.execute(
+            select(User.id, User.name, User.job_role).where(User.id.in_(user_ids))
+        )
+        return {row.id: UserSummary(*row) for row in result}
 
 
 # Service Implementations
@@ -81,48 +392,211 @@ class UserService:
     def __init__(self, user_repository: UserRepositoryProtocol):
         self._user_repository = user_repository
     
-    def _hash_password(self, password: str) -> str:
-        import hashlib
-        return hashlib.sha256(password.encode()).hexdigest()
-    
-    def authenticate(self, userid: str, password: str, phone: str, db: Session) -> Optional[User]:
-        password_hash = self._hash_password(password)
-        return self._user_repository.authenticate(userid, password_hash, phone, db)
+    def import_users(self, rows: List[Dict[str, str]], db: Session) -> Tuple[int, List[str]]:
+        """Insert rows whose passwords are already hashed; returns (inserted, duplicate userids).
+
+        Userids already stored or repeated within ``rows`` are found with one indexed lookup
+        and never sent to the database.
+        """
+        existing = self._user_repository.get_existing_userids([row["userid"] for row in rows], db)
+        duplicates = []
+        unique_rows = []
+        for row in rows:
+            if row["userid"] in existing:
+                duplicates.append(row["userid"])
+            else:
+                existing.add(row["userid"])
+                unique_rows.append(row)
+        if not unique_rows:
+            return 0, duplicates
+        return self._user_repository.bulk_create(unique_rows, db), duplicates
+
+
+# Async Service Implementations
+class AsyncUserService:
+    def __init__(self, user_repository: AsyncUserRepositoryProtocol, password_hasher: PasswordHasher):
+        self._user_repository = user_repository
+        self._password_hasher = password_hasher
     
-    def create_user(self, name: str, userid: str, password: str, phone: str, db: Session) -> bool:
-        # Check if user already exists
-        existing_user = self._user_repository.get_by_userid(userid, db)
-        if existing_user:
-            return False
+    async def authenticate(self, userid: str, password: str, phone: str, db: AsyncSession) -> Optional[User]:
+        user = await self._user_repository.get_by_userid(userid, db)
+        # Release the connection while the hash is verified on the worker pool
+        await db.close()
+        if not await self._password_hasher.verify(password, user.password if user else None):
+            return None
+        if user.phone != phone:
+            return None
         
-        # Create new user
-        password_hash = self._hash_password(password)
+        # Upgrade legacy or weaker hashes while the plaintext is at hand
+        if self._password_hasher.needs_rehash(user.password):
+            try:
+                password_hash = await self._password_hasher.hash(password)
+            except HashingBusyError:
+                # The login already succeeded; upgrade on a later one
+                return user
+            user = await db.merge(user, load=False)
+            await self._user_repository.update_password(user, password_hash, db)
+        return user
+    
+    async def create_user(self, name: str, userid: str, password: str, phone: str, db: AsyncSession) -> bool:
+        # Hash before touching the database so a connection is held only for the insert
+        password_hash = await self._password_hasher.hash(password)
         new_user = User(name=name, userid=userid, password=password_hash, phone=phone)
-        return self._user_repository.create(new_user, db)
+        return await self._user_repository.create(new_user, db)
     
-    def get_user_by_userid(self, userid: str, db: Session) -> Optional[User]:
-        return self._user_repository.get_by_userid(userid, db)
+    async def get_user_by_userid(self, userid: str, db: AsyncSession) -> Optional[User]:
+        return await self._user_repository.get_by_userid(userid, db)
 
 
-class SkillService:
-    def __init__(self, skill_repository: SkillRepositoryProtocol):
+class AsyncSkillService:
+    def __init__(self, skill_repository: AsyncSkillRepositoryProtocol, catalog_cache: CatalogCache):
         self._skill_repository = skill_repository
+        self._catalog_cache = catalog_cache
+    
+    async def get_job_roles(self, db: AsyncSession) -> List[str]:
+        roles = self._catalog_cache.get(("roles",))
+        if roles is MISSING:
+            job_roles = await self._skill_repository.get_all_job_roles(db)
+            roles = [role.name for role in job_roles]
+            self._catalog_cache.set(("roles",), roles)
+        return roles
+    
+    async def get_skills_for_role(self, role: str, db: AsyncSession) -> Dict[str, List[str]]:
+        skills = self._catalog_cache.get(("skills", role))
+        if skills is MISSING:
+            rows = await self._skill_repository.get_skill_rows_by_role(role, db)
+            skills = group_skill_rows(rows)
+            self._catalog_cache.set(("skills", role), skills)
+        return skills
     
-    def get_job_roles(self, db: Session) -> List[str]:
-        job_roles = self._skill_repository.get_all_job_roles(db)
-        return [role.name for role in job_roles]
+    async def get_skills_for_roles(self, roles: Optional[List[str]], db: AsyncSession) -> Dict[str, Dict[str, List[str]]]:
+        """Grouped skills for several roles (all roles when None), with one query for every cache miss"""
+        if roles is None:
+            roles = await self.get_job_roles(db)
+        
+        skills_by_role = {role: self._catalog_cache.get(("skills", role)) for role in roles}
+        missing = [role for role, skills in skills_by_role.items() if skills is MISSING]
+        if missing:
+            rows = await self._skill_repository.get_skill_rows_by_roles(missing, db)
+            fetched = {
+                role: group_skill_rows([row[1:] for row in group])
+                for role, group in groupby(rows, key=itemgetter(0))
+            }
+            for role in missing:
+                skills_by_role[role] = fetched.get(role, {})
+                self._catalog_cache.set(("skills", role), skills_by_role[role])
+        return skills_by_role
+    
+    async def refresh_catalog(self, db: AsyncSession) -> bool:
+        """Reload the catalog into the cache; entries are dropped only if its version changed"""
+        job_roles = await self._skill_repository.get_all_job_roles(db)
+        rows = await self._skill_repository.get_catalog_rows(db)
+        return self._catalog_cache.load([role.name for role in job_roles], rows)
     
-    def get_skills_for_role(self, role: str, db: Session) -> Dict[str, List[str]]:
-        job_role = self._skill_repository.get_skills_by_role(role, db)
-        if job_role:
-            # Group skills by category
-            skills_by_category = {}
-            for skill in job_role.skills:
-                if skill.category not in skills_by_category:
-                    skills_by_category[skill.category] = []
-                skills_by_category[skill.category].append(skill.name)
-            return skills_by_category
-        return {}
+    @property
+    def catalog_version(self) -> Optional[str]:
+        return self._catalog_cache.version
+    
+    @property
+    def catalog_updated_at(self) -> Optional[datetime]:
+        return self._catalog_cache.updated_at
+
+
+class AsyncUserSkillService:
+    def __init__(
+        self,
+        user_skill_repository: AsyncUserSkillRepositoryProtocol,
+        listeners: Sequence[SkillSelectionListener] = ()
+    ):
+        self._user_skill_repository = user_skill_repository
+        self._listeners = list(listeners)
+    
+    async def get_selection(self, user_id: int, db: AsyncSession) -> Tuple[Optional[str], List[str]]:
+        job_role, skills = await self._user_skill_repository.get_selection(user_id, db)
+        return job_role, sorted(skills.values())
+    
+    async def save_selection(
+        self, user_id: int, job_role: Optional[str], skill_names: List[str], db: AsyncSession
+    ) -> SkillSelectionChange:
+        """Replace the user's role and skill set, writing only the difference in one transaction"""
+        job_role_before, stored = await self._user_skill_repository.get_selection(user_id, db)
+        stored_ids = {name: skill_id for skill_id, name in stored.items()}
+        
+        wanted = set(skill_names)
+        missing = [name for name in wanted if name not in stored_ids]
+        resolved = await self._user_skill_repository.resolve_skill_ids(missing, job_role, db) if missing else {}
+        
+        added = sorted(resolved)
+        removed = sorted(name for name in stored_ids if name not in wanted)
+        if added or removed or job_role != job_role_before:
+            await self._user_skill_repository.apply_selection(
+                user_id,
+                job_role,
+                [resolved[name] for name in added],
+                [stored_ids[name] for name in removed],
+                db
+            )
+        skills = sorted((set(stored_ids) - set(removed)) | set(added))
+        if added or removed:
+            for listener in self._listeners:
+                listener.on_selection_change(user_id, skills, added, removed)
+        return SkillSelectionChange(job_role, skills, added, removed)
+    
+    async def search_users(
+        self, skill_names: List[str], match_all: bool, after: int, limit: int, db: AsyncSession
+    ) -> Tuple[List[UserSummary], Optional[int]]:
+        """A page of matching users plus the cursor for the next page (None on the last page)"""
+        users = await self._user_skill_repository.search_users_by_skills(skill_names, match_all, after, limit, db)
+        next_after = users[-1].id if len(users) == limit else None
+        return users, next_after
+
+
+class AsyncSkillMatchService:
+    def __init__(
+        self,
+        user_skill_repository: AsyncUserSkillRepositoryProtocol,
+        skill_index: SkillIndex,
+        skill_cooccurrence: SkillCooccurrence
+    ):
+        self._user_skill_repository = user_skill_repository
+        self._skill_index = skill_index
+        self._skill_cooccurrence = skill_cooccurrence
+    
+    async def rebuild_index(self, db: AsyncSession) -> None:
+        """Reload the skill index from user_skills"""
+        await self._reload(self._skill_index, db)
+    
+    async def load_cooccurrence(self, db: AsyncSession) -> None:
+        """Count skill pairs once; saves in this process keep them current afterwards"""
+        await self._reload(self._skill_cooccurrence, db)
+    
+    async def _reload(self, target, db: AsyncSession) -> None:
+        # Rows are streamed in batches and every batch is processed in a worker thread, so the
+        # event loop never holds the whole table or runs the build; install swaps the result in
+        target.begin_rebuild()
+        try:
+            collected = {}
+            async for rows in self._user_skill_repository.stream_user_skill_names(db):
+                await asyncio.to_thread(target.collect, collected, rows)
+            built = await asyncio.to_thread(target.build, collected)
+        except BaseException:
+            target.cancel_rebuild()
+            raise
+        target.install(built)
+    
+    def related_skills(self, skill_names: List[str], limit: int) -> List[Tuple[str, int]]:
+        return self._skill_cooccurrence.suggest(skill_names, limit)
+    
+    async def match(
+        self, skill_names: List[str], min_overlap: int, limit: int, db: AsyncSession
+    ) -> Tuple[List[Tuple[UserSummary, int]], int]:
+        """Users holding at least ``min_overlap`` of the skills, most overlap first, and the total matched"""
+        ranked, total = self._skill_index.top_k(skill_names, limit, min_overlap)
+        if not ranked:
+            return [], total
+        # Only the page is read from the database; matching itself is in memory
+        summaries = await self._user_skill_repository.get_user_summaries([user_id for user_id, _ in ranked], db)
+        return [(summaries[user_id], overlap) for user_id, overlap in ranked if user_id in summaries], total
 
 
 # Dependency Injection Container
@@ -130,21 +604,116 @@ class Container(containers.DeclarativeContainer):
     # Configuration
     config = providers.Configuration()
     
+    # Pre-encoded API responses, rebuilt when the catalog version changes
+    catalog_snapshots = providers.Singleton(
+        CatalogSnapshotStore,
+        gzip_min_size=config.catalog_cache.gzip_min_size
+    )
+    
+    # Role skill vectors for recommendations, rebuilt when the catalog version changes
+    role_recommender = providers.Singleton(RoleRecommender)
+    
+    # Skill and role name prefix and typo-tolerant search, rebuilt when the catalog version changes
+    catalog_autocomplete = providers.Singleton(CatalogAutocomplete)
+    fuzzy_skill_search = providers.Singleton(FuzzySkillSearch)
+    
+    # Catalog cache shared by the sync and async skill services
+    catalog_cache = providers.Singleton(
+        CatalogCache,
+        max_entries=config.catalog_cache.max_entries,
+        ttl=config.catalog_cache.ttl,
+        listeners=providers.List(catalog_snapshots, role_recommender, catalog_autocomplete, fuzzy_skill_search)
+    )
+    
+    # Skill -> users inverted index and skill pair counts, kept current by skill saves
+    skill_index = providers.Singleton(SkillIndex)
+    skill_cooccurrence = providers.Singleton(SkillCooccurrence)
+    
+    # Password hashing on a bounded worker pool
+    password_hasher = providers.Singleton(
+        PasswordHasher,
+        max_workers=config.hashing.workers,
+        max_pending=config.hashing.max_pending
+    )
+    
+    # Login/signup rate limiting, in-process or shared through Redis
+    rate_limit_backend = providers.Selector(
+        config.rate_limit.backend,
+        memory=providers.Singleton(MemoryRateLimitBackend),
+        redis=providers.Singleton(RedisRateLimitBackend.from_url, config.rate_limit.redis_url)
+    )
+    
+    rate_limiter = providers.Singleton(
+        RateLimiter,
+        backend=rate_limit_backend,
+        window=config.rate_limit.window,
+        login_ip_limit=config.rate_limit.login_ip_limit,
+        login_user_limit=config.rate_limit.login_user_limit,
+        signup_ip_limit=config.rate_limit.signup_ip_limit
+    )
+    
+    # Server-side session storage ("cookie" keeps Starlette's signed-cookie sessions)
+    session_backend = providers.Selector(
+        config.session.backend,
+        memory=providers.Singleton(MemorySessionBackend, max_entries=config.session.max_entries),
+        sqlite=providers.Singleton(SQLiteSessionBackend, path=config.session.sqlite_path),
+        redis=providers.Singleton(RedisSessionBackend.from_url, config.session.redis_url)
+    )
+    
     # Repositories
     user_repository = providers.Factory(UserRepository)
-    skill_repository = providers.Factory(SkillRepository)
     
     # Services
-    user_service = providers.Factory(
-        UserService,
-        user_repository=user_repository
+    user_service = providers.Factory(UserService, user_repository=user_repository)
+    
+    # Async Repositories
+    async_user_repository = providers.Factory(AsyncUserRepository)
+    async_skill_repository = providers.Factory(AsyncSkillRepository)
+    async_user_skill_repository = providers.Factory(AsyncUserSkillRepository)
+    
+    # Async Services
+    async_user_service = providers.Factory(
+        AsyncUserService,
+        user_repository=async_user_repository,
+        password_hasher=password_hasher
+    )
+    
+    async_skill_service = providers.Factory(
+        AsyncSkillService,
+        skill_repository=async_skill_repository,
+        catalog_cache=catalog_cache
+    )
+    
+    async_user_skill_service = providers.Factory(
+        AsyncUserSkillService,
+        user_skill_repository=async_user_skill_repository,
+        listeners=providers.List(skill_index, skill_cooccurrence)
     )
     
-    skill_service = providers.Factory(
-        SkillService,
-        skill_repository=skill_repository
+    async_skill_match_service = providers.Factory(
+        AsyncSkillMatchService,
+        user_skill_repository=async_user_skill_repository,
+        skill_index=skill_index,
+        skill_cooccurrence=skill_cooccurrence
     )
 
 
 # Global container instance
-container = Container()
\ No newline at end of file
+container = Container()
+container.config.hashing.workers.from_env("PASSWORD_HASH_WORKERS", default=default_workers(), as_=int)
+container.config.hashing.max_pending.from_env("PASSWORD_HASH_MAX_PENDING", default=64, as_=int)
+container.config.session.backend.from_env("SESSION_BACKEND", default="cookie")
+container.config.session.max_entries.from_env("SESSION_MAX_ENTRIES", default=100000, as_=int)
+container.config.session.sqlite_path.from_env("SESSION_SQLITE_PATH", default="sessions.db")
+container.config.session.redis_url.from_env("SESSION_REDIS_URL", default="redis://localhost:6379/0")
+container.config.rate_limit.backend.from_env("RATE_LIMIT_BACKEND", default="memory")
+container.config.rate_limit.redis_url.from_env("RATE_LIMIT_REDIS_URL", default="redis://localhost:6379/0")
+container.config.rate_limit.window.from_env("RATE_LIMIT_WINDOW", default=60, as_=float)
+container.config.rate_limit.login_ip_limit.from_env("LOGIN_RATE_LIMIT_PER_IP", default=30, as_=int)
+container.config.rate_limit.login_user_limit.from_env("LOGIN_RATE_LIMIT_PER_USER", default=5, as_=int)
+container.config.rate_limit.signup_ip_limit.from_env("SIGNUP_RATE_LIMIT_PER_IP", default=10, as_=int)
+container.config.catalog_cache.max_entries.from_env("CATALOG_CACHE_SIZE", default=1024, as_=int)
+container.config.catalog_cache.ttl.from_env("CATALOG_CACHE_TTL", default=600, as_=float)
+container.config.catalog_cache.gzip_min_size.from_env("CATALOG_GZIP_MIN_SIZE", default=512, as_=int)
+container.config.catalog_cache.refresh_interval.from_env("CATALOG_REFRESH_INTERVAL", default=60, as_=float)
+container.config.skill_index.rebuild_interval.from_env("SKILL_INDEX_REBUILD_INTERVAL", default=300, as_=float)
\ No newline at end of file
@@ -0,0 +1,114 @@
+import heapq
+from collections import Counter
+from itertools import combinations
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+
+class SkillCooccurrence:
+    """Sparse skill x skill counts of how many users picked both skills.
+
+    Counted in full once, at startup; after that each save only adjusts the
+    pairs it created or broke. Each user's current skill set is kept for that,
+    which also makes re-applying a save a no-op (so replay after the load is
+    safe). Per-skill top-N lists are computed on first use and dropped only
+    when one of that skill's counts changes.
+    """
+
+    def __init__(self, top_n: int = 20):
+        self.top_n = top_n
+        self._user_skills: Dict[int, FrozenSet[str]] = {}
+        self._counts: Dict[str, Counter] = {}
+        self._top: Dict[str, List[Tuple[str, int]]] = {}
+        self._replay: Optional[List[Tuple[int, List[str]]]] = None
+
+    def begin_rebuild(self) -> None:
+        self._replay = []
+
+    def cancel_rebuild(self) -> None:
+        self._replay = None
+
+    @staticmethod
+    def collect(user_skills: Dict[int, Set[str]], rows: Iterable[Tuple[int, str]]) -> None:
+        """Add a batch of ``(user_id, skill name)`` rows to a load in progress"""
+        for user_id, name in rows:
+            user_skills.setdefault(user_id, set()).add(name)
+
+    @staticmethod
+    def build(user_skills: Dict[int, Set[str]]) -> Tuple[Dict[int, FrozenSet[str]], Dict[str, Counter]]:
+        """Count every pair; like ``collect`` it touches no shared state, so both can run in a worker thread"""
+        counts: Dict[str, Counter] = {}
+        for skills in user_skills.values():
+            for name, other in combinations(skills, 2):
+                counts.setdefault(name, Counter())[other] += 1
+                counts.setdefault(other, Counter())[name] += 1
+        return {user_id: frozenset(skills) for user_id, skills in user_skills.items()}, counts
+
+    def install(self, built: Tuple[Dict[int, FrozenSet[str]], Dict[str, Counter]]) -> None:
+        """Replace all counts with the result of ``build``, replaying saves made since ``begin_rebuild``"""
+        self._user_skills, self._counts = built
+        self._top = {}
+        replay, self._replay = self._replay or [], None
+        for user_id, skills in replay:
+            self._apply(user_id, skills)
+
+    def on_selection_change(self, user_id: int, skills: List[str], added: List[str], removed: List[str]) -> None:
+        if self._replay is not None:
+            self._replay.append((user_id, skills))
+        self._apply(user_id, skills)
+
+    def _apply(self, user_id: int, skills: Iterable[str]) -> None:
+        before = self._user_skills.get(user_id, frozenset())
+        after = frozenset(skills)
+        if before == after:
+            return
+        kept = before & after
+        removed = before - after
+        added = after - before
+        for name in removed:
+            for other in kept:
+                self._bump(name, other, -1)
+        for name, other in combinations(removed, 2):
+            self._bump(name, other, -1)
+        for name in added:
+            for other in kept:
+                self._bump(name, other, 1)
+        for name, other in combinations(added, 2):
+            self._bump(name, other, 1)
+        if after:
+            self._user_skills[user_id] = after
+        else:
+            self._user_skills.pop(user_id, None)
+
+    def _bump(self, first: str, second: str, delta: int) -> None:
+        for name, other in ((first, second), (second, first)):
+            counts = self._counts.setdefault(name, Counter())
+            counts[other] += delta
+            if counts[other] <= 0:
+                del counts[other]
+            self._top.pop(name, None)
+
+    def related(self, name: str) -> List[Tuple[str, int]]:
+        """Skills most often picked together with ``name``, most common first"""
+        top = self._top.get(name)
+        if top is None:
+            counts = self._counts.get(name, {})
+            top = heapq.nsmallest(self.top_n, counts.items(), key=lambda item: (-item[1], item[0]))
+            self._top[name] = top
+        return top
+
+    def suggest(self, names: List[str], limit: int = 10) -> List[Tuple[str, int]]:
+        """Skills to add to ``names``, summing each selected skill's top-N list"""
+        selected = set(names)
+        scores: Counter = Counter()
+        for name in selected:
+            for other, count in self.related(name):
+                if other not in selected:
+                    scores[other] += count
+        return heapq.nsmallest(limit, scores.items(), key=lambda item: (-item[1], item[0]))
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "users": len(self._user_skills),
+            "skills": len(self._counts),
+            "pairs": sum(len(counts) for counts in self._counts.values()) // 2,
+        }
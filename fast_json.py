@@ -0,0 +1,55 @@
+import json
+from typing import Any
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize straight to bytes, with the same output and errors as FastAPI's JSONResponse.
+
+    jsonable_encoder only sees values the encoder can't handle natively.
+    """
+    if orjson is not None:
+        try:
+            # int, float, bool and None keys become strings, as with the stdlib encoder
+            body = orjson.dumps(content, default=jsonable_encoder, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # Integers beyond 64 bits and keys orjson can't take; the stdlib encoder handles them
+            pass
+        else:
+            # orjson writes NaN and Infinity as null where the stdlib encoder refuses them,
+            # so any body containing null is re-encoded to raise the same error
+            if b"null" not in body:
+                return body
+    return _stdlib_dumps(content)
+
+
+def _stdlib_dumps(content: Any) -> bytes:
+    # Same separators and escaping as FastAPI's JSONResponse
+    try:
+        text = json.dumps(
+            content, ensure_ascii=False, allow_nan=False, separators=(",", ":"), default=jsonable_encoder
+        )
+    except TypeError:
+        # Dict keys neither encoder takes as-is (a UUID, a tuple); convert the whole tree as FastAPI would
+        text = json.dumps(
+            jsonable_encoder(content), ensure_ascii=False, allow_nan=False, separators=(",", ":")
+        )
+    return text.encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with orjson when installed, else the stdlib encoder.
+
+    Used as api_router's default_response_class. Hot endpoints return it directly
+    with their content, which skips FastAPI's whole-structure jsonable_encoder pass.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
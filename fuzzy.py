@@ -0,0 +1,99 @@
+import sys
+from collections import Counter
+from itertools import chain
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+
+class FuzzyMatch(NamedTuple):
+    name: str
+    distance: int
+    contexts: Tuple[Tuple[str, str], ...]
+
+
+def trigrams(text: str) -> Set[str]:
+    # Padded so short words and word boundaries still produce trigrams
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def levenshtein(first: str, second: str, max_distance: int) -> int:
+    """Edit distance, or ``max_distance + 1`` as soon as it is known to exceed it"""
+    if abs(len(first) - len(second)) > max_distance:
+        return max_distance + 1
+    previous = list(range(len(second) + 1))
+    for i, first_char in enumerate(first, 1):
+        current = [i]
+        for j, second_char in enumerate(second, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (first_char != second_char),
+            ))
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous = current
+    return previous[-1]
+
+
+class FuzzySkillSearch:
+    """Typo-tolerant skill name search: trigram candidates, re-ranked by edit distance.
+
+    A query is compared to each candidate's whole name and to its first
+    ``len(query)`` characters, so both "Kubernets" and "postgre" match. Rebuilt by
+    CatalogCache only when the catalog version changes.
+    """
+
+    def __init__(self, max_candidates: int = 50):
+        self.max_candidates = max_candidates
+        self.version: Optional[str] = None
+        self._names: List[str] = []
+        self._keys: List[str] = []
+        self._contexts: List[Tuple[Tuple[str, str], ...]] = []
+        self._postings: Dict[str, List[int]] = {}
+
+    def on_catalog_change(self, version: str, roles: List[str], rows: List[Tuple[str, str, str]]) -> None:
+        contexts: Dict[str, List[Tuple[str, str]]] = {}
+        for role, category, name in rows:
+            contexts.setdefault(sys.intern(name), []).append((sys.intern(role), sys.intern(category)))
+
+        postings: Dict[str, List[int]] = {}
+        keys = [name.casefold() for name in contexts]
+        for name_id, key in enumerate(keys):
+            for trigram in trigrams(key):
+                postings.setdefault(trigram, []).append(name_id)
+
+        self._names = list(contexts)
+        self._keys = keys
+        self._contexts = [tuple(pairs) for pairs in contexts.values()]
+        self._postings = postings
+        self.version = version
+
+    def search(self, query: str, limit: int = 10, max_distance: Optional[int] = None) -> List[FuzzyMatch]:
+        query = " ".join(query.casefold().split())
+        if not query:
+            return []
+        if max_distance is None:
+            # One typo per three characters typed
+            max_distance = max(1, len(query) // 3)
+
+        query_trigrams = trigrams(query)
+        overlap = Counter(chain.from_iterable(self._postings.get(trigram, ()) for trigram in query_trigrams))
+        candidates = overlap.most_common(self.max_candidates)
+
+        matches = []
+        for name_id, _ in candidates:
+            key = self._keys[name_id]
+            distance = min(
+                levenshtein(query, key, max_distance),
+                levenshtein(query, key[:len(query)], max_distance),
+            )
+            if distance <= max_distance:
+                matches.append((distance, -overlap[name_id], len(key), name_id))
+        matches.sort()
+        return [
+            FuzzyMatch(self._names[name_id], distance, self._contexts[name_id])
+            for distance, _, _, name_id in matches[:limit]
+        ]
+
+    def stats(self) -> Dict[str, int]:
+        return {"names": len(self._names), "trigrams": len(self._postings)}
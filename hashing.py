@@ -0,0 +1,123 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+import os
+import secrets
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+
+# scrypt cost: n = 2**SCRYPT_LOG_N uses 128 * r * n bytes (16 MiB at these settings)
+SCRYPT_LOG_N = 14
+SCRYPT_R = 8
+SCRYPT_P = 1
+SALT_BYTES = 16
+KEY_BYTES = 32
+
+
+class HashingBusyError(Exception):
+    """Raised when too many hash operations are already queued"""
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.b64encode(data).decode().rstrip("=")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.b64decode(data + "=" * (-len(data) % 4))
+
+
+def _scrypt(password: str, salt: bytes, log_n: int, r: int, p: int) -> bytes:
+    return hashlib.scrypt(
+        password.encode(), salt=salt, n=2 ** log_n, r=r, p=p,
+        maxmem=256 * r * 2 ** log_n, dklen=KEY_BYTES
+    )
+
+
+def hash_password(password: str, log_n: int = SCRYPT_LOG_N, r: int = SCRYPT_R, p: int = SCRYPT_P) -> str:
+    """Hash a password as ``scrypt$ln=<log2 n>,r=<r>,p=<p>$<salt>$<key>``"""
+    salt = secrets.token_bytes(SALT_BYTES)
+    key = _scrypt(password, salt, log_n, r, p)
+    return f"scrypt$ln={log_n},r={r},p={p}${_b64encode(salt)}${_b64encode(key)}"
+
+
+def _parse_scrypt(encoded: str) -> Optional[Tuple[int, int, int, bytes, bytes]]:
+    try:
+        scheme, params, salt, key = encoded.split("$")
+        if scheme != "scrypt":
+            return None
+        values = dict(param.split("=") for param in params.split(","))
+        return int(values["ln"]), int(values["r"]), int(values["p"]), _b64decode(salt), _b64decode(key)
+    except (ValueError, KeyError):
+        return None
+
+
+def is_legacy_hash(encoded: str) -> bool:
+    """Unsalted SHA-256 hex digests written before scrypt was introduced"""
+    return len(encoded) == 64 and all(char in "0123456789abcdef" for char in encoded)
+
+
+def verify_password(password: str, encoded: str) -> bool:
+    if is_legacy_hash(encoded):
+        return hmac.compare_digest(hashlib.sha256(password.encode()).hexdigest(), encoded)
+    parsed = _parse_scrypt(encoded)
+    if parsed is None:
+        return False
+    log_n, r, p, salt, key = parsed
+    return hmac.compare_digest(_scrypt(password, salt, log_n, r, p), key)
+
+
+def needs_rehash(encoded: str, log_n: int = SCRYPT_LOG_N, r: int = SCRYPT_R, p: int = SCRYPT_P) -> bool:
+    parsed = _parse_scrypt(encoded)
+    return parsed is None or parsed[:3] != (log_n, r, p)
+
+
+class PasswordHasher:
+    """Runs scrypt on a bounded worker pool so hashing never blocks the event loop.
+
+    At most ``max_pending`` operations may be queued or running; further calls fail
+    fast with HashingBusyError instead of growing the queue during login bursts.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int, log_n: int = SCRYPT_LOG_N):
+        self.log_n = log_n
+        self.max_pending = max_pending
+        self._pending = 0
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hash")
+        # Verifying against this keeps unknown-user logins as slow as real ones
+        self._dummy_hash = hash_password(secrets.token_urlsafe(16), log_n=log_n)
+
+    def hash_sync(self, password: str) -> str:
+        return hash_password(password, log_n=self.log_n)
+
+    def verify_sync(self, password: str, encoded: Optional[str]) -> bool:
+        if encoded is None:
+            verify_password(password, self._dummy_hash)
+            return False
+        return verify_password(password, encoded)
+
+    def needs_rehash(self, encoded: str) -> bool:
+        return needs_rehash(encoded, log_n=self.log_n)
+
+    async def _run(self, func, *args):
+        if self._pending >= self.max_pending:
+            raise HashingBusyError("Password hashing queue is full")
+        self._pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+        finally:
+            self._pending -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(self.hash_sync, password)
+
+    async def verify(self, password: str, encoded: Optional[str]) -> bool:
+        """Check a password; pass None for unknown users to spend the same time"""
+        return await self._run(self.verify_sync, password, encoded)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def default_workers() -> int:
+    return os.cpu_count() or 1
@@ -0,0 +1,97 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Optional
+
+from fastapi import Request, Response
+
+from snapshot import EncodedPayload
+
+
+def catalog_etag(version: Optional[str], *parts: str) -> Optional[str]:
+    """Strong ETag for a catalog resource; the version is a content digest so it changes with the data"""
+    if version is None:
+        return None
+    digest = hashlib.sha256("\0".join((version,) + parts).encode()).hexdigest()[:20]
+    return f'"{digest}"'
+
+
+def cache_headers(etag: Optional[str], last_modified: Optional[datetime], max_age: int) -> Dict[str, str]:
+    headers = {"Cache-Control": f"public, max-age={max_age}, must-revalidate"}
+    if etag:
+        headers["ETag"] = etag
+    if last_modified:
+        headers["Last-Modified"] = format_datetime(last_modified.astimezone(timezone.utc), usegmt=True)
+    return headers
+
+
+def is_not_modified(request: Request, etag: Optional[str], last_modified: Optional[datetime]) -> bool:
+    """Evaluate If-None-Match, falling back to If-Modified-Since when it is absent (RFC 9110)"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if etag is None:
+            return False
+        candidates = [tag.strip() for tag in if_none_match.split(",")]
+        # Weak comparison, as required for If-None-Match
+        return "*" in candidates or etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return last_modified.replace(microsecond=0) <= since
+    return False
+
+
+def not_modified_response(headers: Dict[str, str]) -> Response:
+    return Response(status_code=304, headers=headers)
+
+
+def accepts_encoding(request: Request, encoding: str) -> bool:
+    """Whether Accept-Encoding allows ``encoding`` (or ``*``) with a non-zero quality"""
+    for coding in request.headers.get("accept-encoding", "").split(","):
+        name, _, params = coding.strip().partition(";")
+        if name.strip().lower() not in (encoding, "*"):
+            continue
+        quality = params.strip()
+        if quality.startswith("q="):
+            try:
+                return float(quality[2:]) > 0
+            except ValueError:
+                return False
+        return True
+    return False
+
+
+def accepts_gzip(request: Request) -> bool:
+    return accepts_encoding(request, "gzip")
+
+
+def payload_response(
+    request: Request,
+    payload: EncodedPayload,
+    last_modified: Optional[datetime],
+    max_age: int,
+) -> Response:
+    """Serve pre-encoded bytes as-is, picking the gzip variant when the client accepts it"""
+    use_gzip = payload.gzip_body is not None and accepts_gzip(request)
+    etag = payload.gzip_etag if use_gzip else payload.etag
+    headers = cache_headers(etag, last_modified, max_age)
+    if payload.gzip_body is not None:
+        headers["Vary"] = "Accept-Encoding"
+
+    # Either variant's ETag validates the client's cached copy
+    other_etag = payload.etag if use_gzip else payload.gzip_etag
+    if is_not_modified(request, etag, last_modified) or (
+        other_etag is not None and is_not_modified(request, other_etag, None)
+    ):
+        return not_modified_response(headers)
+
+    if use_gzip:
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=payload.gzip_body, media_type="application/json", headers=headers)
+    return Response(content=payload.body, media_type="application/json", headers=headers)
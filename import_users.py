@@ -0,0 +1,137 @@
+"""Bulk user import from partner CSV or NDJSON exports.
+
+Usage:
+    python import_users.py users.csv --batch-size 2000 --checkpoint users.ckpt
+    python import_users.py users.ndjson --on-duplicate report --report duplicates.txt
+
+Rows need name, userid, password and phone. Passwords are hashed in a process
+pool and each batch is inserted with one executemany. After every committed
+batch the checkpoint records how many input rows are done, so a rerun with the
+same checkpoint resumes where the last run stopped.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import islice
+from typing import Dict, Iterator, List, TextIO
+
+from hashing import hash_password, SCRYPT_LOG_N
+
+REQUIRED_FIELDS = ("name", "userid", "password", "phone")
+
+
+def read_rows(stream: TextIO, file_format: str) -> Iterator[Dict[str, str]]:
+    if file_format == "csv":
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield row
+    else:
+        for line in stream:
+            if line.strip():
+                yield json.loads(line)
+
+
+def load_checkpoint(path: str) -> Dict[str, int]:
+    if path and os.path.exists(path):
+        with open(path) as f:
+            return json.load(f)
+    return {"rows_done": 0, "inserted": 0, "duplicates": 0, "invalid": 0}
+
+
+def save_checkpoint(path: str, state: Dict[str, int]) -> None:
+    if not path:
+        return
+    # Write then rename, so a crash never leaves a truncated checkpoint
+    temp_path = path + ".tmp"
+    with open(temp_path, "w") as f:
+        json.dump(state, f)
+    os.replace(temp_path, path)
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Bulk import users from CSV or NDJSON")
+    parser.add_argument("input", help="CSV or NDJSON file")
+    parser.add_argument("--format", choices=("csv", "ndjson"), help="defaults to the file extension")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="hashing processes")
+    parser.add_argument(
+        "--hash-cost", type=int, default=SCRYPT_LOG_N,
+        help="scrypt log2(N); lower values are upgraded automatically on each user's first login"
+    )
+    parser.add_argument("--checkpoint", help="progress file used to resume after a failure")
+    parser.add_argument("--on-duplicate", choices=("skip", "report"), default="skip")
+    parser.add_argument("--report", help="write duplicate and invalid userids here instead of stderr")
+    args = parser.parse_args(argv)
+
+    file_format = args.format or ("csv" if args.input.lower().endswith(".csv") else "ndjson")
+    report_duplicates = args.on_duplicate == "report"
+
+    # Imported here so --help works without a database configured
+    from container import container
+    from database import SessionLocal, create_tables
+
+    create_tables()
+    user_service = container.user_service()
+    state = load_checkpoint(args.checkpoint)
+    report = open(args.report, "a") if args.report else sys.stderr
+    hash_with_cost = partial(hash_password, log_n=args.hash_cost)
+    started = time.perf_counter()
+    processed = 0
+
+    with open(args.input, newline="") as stream, ProcessPoolExecutor(max_workers=args.workers) as pool:
+        rows = islice(read_rows(stream, file_format), state["rows_done"], None)
+        while True:
+            batch = list(islice(rows, args.batch_size))
+            if not batch:
+                break
+
+            records = []
+            for row in batch:
+                if all(row.get(field) for field in REQUIRED_FIELDS):
+                    records.append({field: str(row[field]) for field in REQUIRED_FIELDS})
+                else:
+                    state["invalid"] += 1
+                    print(f"invalid\t{row.get('userid', '')}", file=report)
+
+            chunksize = max(1, len(records) // (args.workers * 4))
+            hashes = pool.map(hash_with_cost, [record["password"] for record in records], chunksize=chunksize)
+            for record, password_hash in zip(records, hashes):
+                record["password"] = password_hash
+
+            with SessionLocal() as db:
+                inserted, duplicates = user_service.import_users(records, db)
+            if report_duplicates:
+                for userid in duplicates:
+                    print(f"duplicate\t{userid}", file=report)
+
+            state["rows_done"] += len(batch)
+            state["inserted"] += inserted
+            state["duplicates"] += len(duplicates)
+            save_checkpoint(args.checkpoint, state)
+
+            processed += len(batch)
+            elapsed = time.perf_counter() - started
+            print(
+                f"{state['rows_done']} rows done, {state['inserted']} inserted, "
+                f"{state['duplicates']} duplicates, {processed / elapsed:.0f} rows/s",
+                file=sys.stderr,
+            )
+
+    if report is not sys.stderr:
+        report.close()
+    elapsed = time.perf_counter() - started
+    print(
+        f"Imported {state['inserted']} users ({state['duplicates']} duplicates, {state['invalid']} invalid) "
+        f"from {processed} rows in {elapsed:.1f}s",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
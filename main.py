@@ -1,12 +1,20 @@
 from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
 from starlette.middleware.sessions import SessionMiddleware
+import asyncio
+import logging
 import uvicorn
 import os
 
-from database import create_tables, init_db
+from database import create_tables, init_db, engine, async_engine, AsyncSessionLocal, POOL_SETTINGS
+from pool import pool_stats, warm_pool, warm_async_pool
 from container import container
-from routes import auth_router, job_router, api_router
+from routes import auth_router, job_router, api_router, templates, static_pages
+from templating import precompile
+from assets import StaticAssets
+from sessions import ServerSideSessionMiddleware
+from compression import CompressionMiddleware, CompressedBodyCache
+
+logger = logging.getLogger(__name__)
 
 # Create FastAPI app
 app = FastAPI(
@@ -15,12 +23,34 @@ app = FastAPI(
     version="1.0.0"
 )
 
-# Add session middleware with environment-based secret key
+# Add session middleware: server-side storage with an opaque ID cookie,
+# or signed-cookie sessions with an environment-based secret key
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
-app.add_middleware(SessionMiddleware, secret_key=SECRET_KEY)
+if container.config.session.backend() == "cookie":
+    app.add_middleware(SessionMiddleware, secret_key=SECRET_KEY)
+else:
+    app.add_middleware(
+        ServerSideSessionMiddleware,
+        backend=container.session_backend(),
+        # Public catalog endpoints never read the session
+        exclude_paths=("/static", "/health", "/api/roles", "/api/skills")
+    )
+
+# Gzip responses not already compressed, memoizing repeated bodies
+compressed_bodies = CompressedBodyCache(
+    max_entries=int(os.getenv("COMPRESSION_CACHE_SIZE", 256)),
+    compresslevel=int(os.getenv("COMPRESSION_LEVEL", 6))
+)
+app.add_middleware(
+    CompressionMiddleware,
+    body_cache=compressed_bodies,
+    minimum_size=int(os.getenv("COMPRESSION_MIN_SIZE", 500))
+)
 
-# Mount static files
-app.mount("/static", StaticFiles(directory="static"), name="static")
+# Mount static files under content-hashed URLs, precompressed and cached as immutable
+static_assets = StaticAssets("static")
+app.mount("/static", static_assets, name="static")
+templates.env.globals["static_url"] = static_assets.url
 
 # Wire the dependency injection container
 container.wire(modules=["routes"])
@@ -30,17 +60,104 @@ app.include_router(auth_router, tags=["Authentication"])
 app.include_router(job_router, tags=["Job Management"])
 app.include_router(api_router, tags=["API"])
 
+async def refresh_catalog():
+    """Warm the catalog cache, dropping entries if the catalog changed"""
+    async with AsyncSessionLocal() as db:
+        return await container.async_skill_service().refresh_catalog(db)
+
+async def refresh_catalog_periodically(interval: float):
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await refresh_catalog()
+        except Exception as error:
+            # Keep serving the cached catalog; the next pass retries
+            logger.exception("Catalog refresh failed")
+            container.catalog_cache().record_error(error)
+
+async def rebuild_skill_index():
+    async with AsyncSessionLocal() as db:
+        await container.async_skill_match_service().rebuild_index(db)
+
+async def load_skill_cooccurrence():
+    async with AsyncSessionLocal() as db:
+        await container.async_skill_match_service().load_cooccurrence(db)
+
+async def rebuild_skill_index_periodically(interval: float):
+    # Saves on other workers only reach this process's index through a rebuild
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await rebuild_skill_index()
+        except Exception:
+            # Keep serving the current index; the next pass retries
+            logger.exception("Skill index rebuild failed")
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize database on startup"""
+    static_assets.build()
+    precompile(templates)
     create_tables()
     init_db()
+    # Pre-open pooled connections so the first burst doesn't pay for connects
+    warm_pool(engine, POOL_SETTINGS.warmup)
+    await warm_async_pool(async_engine, POOL_SETTINGS.warmup)
+    await refresh_catalog()
+    interval = container.config.catalog_cache.refresh_interval()
+    if interval:
+        app.state.catalog_refresher = asyncio.create_task(refresh_catalog_periodically(interval))
+    await rebuild_skill_index()
+    await load_skill_cooccurrence()
+    interval = container.config.skill_index.rebuild_interval()
+    if interval:
+        app.state.skill_index_rebuilder = asyncio.create_task(rebuild_skill_index_periodically(interval))
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release pooled async database connections"""
+    for task_name in ("catalog_refresher", "skill_index_rebuilder"):
+        task = getattr(app.state, task_name, None)
+        if task:
+            task.cancel()
+    await async_engine.dispose()
+    container.password_hasher().shutdown()
 
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
     return {"status": "healthy", "message": "Job Portal API is running"}
 
+@app.get("/health/pool")
+async def pool_health():
+    """Live connection pool usage and checkout wait times"""
+    return {"sync": pool_stats(engine), "async": pool_stats(async_engine)}
+
+@app.get("/health/cache")
+async def cache_stats():
+    """Catalog cache version, hit/miss counters and the last refresh error"""
+    return container.catalog_cache().stats()
+
+@app.get("/health/skill-index")
+async def skill_index_stats():
+    """Size of the in-memory skill -> users index and skill pair counts"""
+    return {"index": container.skill_index().stats(), "cooccurrence": container.skill_cooccurrence().stats()}
+
+@app.get("/health/templates")
+async def template_stats():
+    """Rendered static page cache hits/misses"""
+    return static_pages.stats()
+
+@app.get("/health/static")
+async def static_manifest():
+    """Fingerprinted static asset URLs and their precompressed sizes"""
+    return static_assets.manifest()
+
+@app.get("/health/compression")
+async def compression_stats():
+    """Compressed bytes in/out, compression CPU time and body cache hits"""
+    return compressed_bodies.stats()
+
 if __name__ == "__main__":
     port = int(os.getenv("PORT", 8002))
     uvicorn.run(app, host="0.0.0.0", port=port)
\ No newline at end of file
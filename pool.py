@@ -0,0 +1,151 @@
+import os
+import threading
+import time
+from typing import Dict, Type
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+class PoolSettings:
+    """Connection pool configuration read from DB_POOL_* environment variables"""
+
+    def __init__(
+        self,
+        pool_size: int = 5,
+        max_overflow: int = 10,
+        timeout: float = 30.0,
+        recycle: int = 1800,
+        pre_ping: bool = True,
+        warmup: int = 0,
+    ):
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.timeout = timeout
+        self.recycle = recycle
+        self.pre_ping = pre_ping
+        self.warmup = min(warmup, pool_size)
+
+    @classmethod
+    def from_env(cls) -> "PoolSettings":
+        pool_size = int(os.getenv("DB_POOL_SIZE", 5))
+        return cls(
+            pool_size=pool_size,
+            max_overflow=int(os.getenv("DB_MAX_OVERFLOW", 10)),
+            timeout=float(os.getenv("DB_POOL_TIMEOUT", 30)),
+            recycle=int(os.getenv("DB_POOL_RECYCLE", 1800)),
+            pre_ping=_env_bool("DB_POOL_PRE_PING", True),
+            warmup=int(os.getenv("DB_POOL_WARMUP", pool_size)),
+        )
+
+    @property
+    def capacity(self) -> int:
+        """Maximum number of connections handed out at once"""
+        return self.pool_size + max(self.max_overflow, 0)
+
+    def engine_kwargs(self) -> Dict:
+        return {
+            "pool_size": self.pool_size,
+            "max_overflow": self.max_overflow,
+            "pool_timeout": self.timeout,
+            "pool_recycle": self.recycle,
+            "pool_pre_ping": self.pre_ping,
+        }
+
+
+class PoolMetrics:
+    """Checkout count, wait time and timeouts observed by an instrumented pool"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record_wait(self, wait: float, timed_out: bool) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_total += wait
+            self.wait_max = max(self.wait_max, wait)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_avg_ms": self.wait_total / attempts * 1000 if attempts else 0.0,
+                "wait_max_ms": self.wait_max * 1000,
+            }
+
+
+def instrumented_pool(base: Type[QueuePool], metrics: PoolMetrics) -> Type[QueuePool]:
+    """Subclass a queue pool so every connection checkout records its wait time.
+
+    Metrics live on the class, so they survive ``pool.recreate()`` on dispose.
+    """
+
+    class InstrumentedPool(base):
+        def _do_get(self):
+            started = time.perf_counter()
+            try:
+                connection = super()._do_get()
+            except PoolTimeoutError:
+                metrics.record_wait(time.perf_counter() - started, timed_out=True)
+                raise
+            metrics.record_wait(time.perf_counter() - started, timed_out=False)
+            return connection
+
+    InstrumentedPool.metrics = metrics
+    InstrumentedPool.__name__ = "Instrumented" + base.__name__
+    return InstrumentedPool
+
+
+def pool_stats(engine) -> Dict:
+    """Live state of an engine's pool; accepts sync engines and AsyncEngine"""
+    pool = getattr(engine, "sync_engine", engine).pool
+    stats = {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        # QueuePool counts overflow down from -pool_size until the pool is full
+        "overflow": max(0, pool.overflow()),
+    }
+    metrics = getattr(pool, "metrics", None)
+    if metrics is not None:
+        stats.update(metrics.snapshot())
+    return stats
+
+
+def warm_pool(engine, count: int) -> None:
+    """Open ``count`` connections at once so the pool starts filled"""
+    connections = []
+    try:
+        for _ in range(count):
+            connections.append(engine.connect())
+    finally:
+        for connection in connections:
+            connection.close()
+
+
+async def warm_async_pool(engine, count: int) -> None:
+    connections = []
+    try:
+        for _ in range(count):
+            connection = engine.connect()
+            await connection.start()
+            connections.append(connection)
+    finally:
+        for connection in connections:
+            await connection.close()
@@ -0,0 +1,114 @@
+import time
+from typing import Dict, List, Optional, Protocol
+
+
+class RateLimitBackend(Protocol):
+    async def hit(self, key: str, limit: int, window: float) -> Optional[float]:
+        """Count one attempt for ``key``; return seconds to wait if over ``limit``, else None"""
+        ...
+
+
+def _sliding_estimate(previous: int, current: int, window: float, now: float) -> float:
+    # Sliding window counter: the previous window's count weighted by how much of it still overlaps
+    return previous * (1 - (now % window) / window) + current
+
+
+class MemoryRateLimitBackend:
+    """Sliding-window counters in process memory, four numbers per key.
+
+    Keys idle for more than a full window are swept every ``sweep_interval`` seconds.
+    """
+
+    def __init__(self, sweep_interval: float = 60.0):
+        self.sweep_interval = sweep_interval
+        # key -> [window, window index, previous count, current count]
+        self._counters: Dict[str, List] = {}
+        self._next_sweep = time.monotonic() + sweep_interval
+
+    async def hit(self, key: str, limit: int, window: float) -> Optional[float]:
+        now = time.monotonic()
+        if now >= self._next_sweep:
+            self._sweep(now)
+
+        index = int(now // window)
+        counter = self._counters.get(key)
+        if counter is None or counter[1] < index - 1:
+            counter = [window, index, 0, 0]
+            self._counters[key] = counter
+        elif counter[1] == index - 1:
+            counter[1:] = [index, counter[3], 0]
+
+        if _sliding_estimate(counter[2], counter[3], window, now) >= limit:
+            return window - now % window
+        counter[3] += 1
+        return None
+
+    def _sweep(self, now: float) -> None:
+        self._counters = {
+            key: counter for key, counter in self._counters.items()
+            if counter[1] >= int(now // counter[0]) - 1
+        }
+        self._next_sweep = now + self.sweep_interval
+
+    def __len__(self) -> int:
+        return len(self._counters)
+
+
+class RedisRateLimitBackend:
+    """Sliding-window counters shared between workers through a Redis-protocol store.
+
+    ``client`` is any ``redis.asyncio``-compatible client, so a local stand-in can replace it.
+    """
+
+    def __init__(self, client, prefix: str = "ratelimit:"):
+        self._client = client
+        self._prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisRateLimitBackend":
+        import redis.asyncio as redis
+        return cls(redis.from_url(url))
+
+    async def hit(self, key: str, limit: int, window: float) -> Optional[float]:
+        now = time.time()
+        index = int(now // window)
+        current_key = f"{self._prefix}{key}:{index}"
+        # One MULTI/EXEC round trip: concurrent workers each see their own increment
+        async with self._client.pipeline(transaction=True) as pipe:
+            pipe.incr(current_key)
+            pipe.expire(current_key, int(window * 2) + 1)
+            pipe.get(f"{self._prefix}{key}:{index - 1}")
+            current, _, previous = await pipe.execute()
+
+        # The estimate includes this attempt, so up to ``limit`` attempts pass
+        if _sliding_estimate(int(previous or 0), int(current), window, now) > limit:
+            return window - now % window
+        return None
+
+
+class RateLimiter:
+    """Login and signup attempt limits per client IP and per userid"""
+
+    def __init__(
+        self,
+        backend: RateLimitBackend,
+        window: float,
+        login_ip_limit: int,
+        login_user_limit: int,
+        signup_ip_limit: int,
+    ):
+        self._backend = backend
+        self.window = window
+        self.login_ip_limit = login_ip_limit
+        self.login_user_limit = login_user_limit
+        self.signup_ip_limit = signup_ip_limit
+
+    async def check_login(self, client_ip: str, userid: str) -> Optional[float]:
+        """Seconds until another login attempt is allowed, or None if this one may proceed"""
+        retry_after = await self._backend.hit(f"login:ip:{client_ip}", self.login_ip_limit, self.window)
+        if retry_after is not None:
+            return retry_after
+        return await self._backend.hit(f"login:user:{userid}", self.login_user_limit, self.window)
+
+    async def check_signup(self, client_ip: str) -> Optional[float]:
+        return await self._backend.hit(f"signup:ip:{client_ip}", self.signup_ip_limit, self.window)
@@ -0,0 +1,67 @@
+import math
+from typing import Dict, List, NamedTuple, Tuple
+
+
+class RoleScore(NamedTuple):
+    role: str
+    score: float
+    matched: int
+    role_skills: int
+
+
+class RoleRecommender:
+    """Ranks job roles against a set of skill names using bitset vectors.
+
+    Every catalog skill name gets a bit; each role is the OR of its skills' bits.
+    The role masks and their popcounts are rebuilt only when the catalog version
+    changes, so scoring a user is one AND and popcount per role.
+    """
+
+    METRICS = ("jaccard", "cosine")
+
+    def __init__(self):
+        self.version = None
+        self._bits: Dict[str, int] = {}
+        self._roles: List[str] = []
+        self._masks: List[int] = []
+        self._sizes: List[int] = []
+
+    def on_catalog_change(self, version: str, roles: List[str], rows: List[Tuple[str, str, str]]) -> None:
+        bits: Dict[str, int] = {}
+        masks = dict.fromkeys(roles, 0)
+        for role, _, name in rows:
+            bit = bits.setdefault(name, 1 << len(bits))
+            masks[role] = masks.get(role, 0) | bit
+        self._bits = bits
+        self._roles = list(masks)
+        self._masks = list(masks.values())
+        self._sizes = [mask.bit_count() for mask in self._masks]
+        self.version = version
+
+    def encode(self, skill_names: List[str]) -> int:
+        """Bit vector of the names; names outside the catalog are ignored"""
+        mask = 0
+        for name in skill_names:
+            mask |= self._bits.get(name, 0)
+        return mask
+
+    def recommend(self, skill_names: List[str], metric: str = "jaccard", limit: int = 5) -> List[RoleScore]:
+        user_mask = self.encode(skill_names)
+        user_size = user_mask.bit_count()
+        if not user_size:
+            return []
+        matched = [(mask & user_mask).bit_count() for mask in self._masks]
+        if metric == "cosine":
+            scores = [
+                count / math.sqrt(size * user_size) if size else 0.0
+                for count, size in zip(matched, self._sizes)
+            ]
+        else:
+            # |A ∩ B| / |A ∪ B|, with the union size from inclusion-exclusion
+            scores = [count / (size + user_size - count) for count, size in zip(matched, self._sizes)]
+        ranked = sorted(
+            (RoleScore(role, round(score, 4), count, size)
+             for role, score, count, size in zip(self._roles, scores, matched, self._sizes) if count),
+            key=lambda item: -item.score
+        )
+        return ranked[:limit]
@@ -1,24 +1,100 @@
-from fastapi import APIRouter, Request, Form, Depends
+import os
+from typing import List, Optional
+
+from fastapi import APIRouter, Request, Form, Query, Depends, HTTPException
+from pydantic import BaseModel, Field
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from dependency_injector.wiring import inject, Provide
 
-from database import get_db
-from container import Container, UserServiceProtocol, SkillServiceProtocol
+from database import get_async_db
+from container import (
+    Container, AsyncUserServiceProtocol, AsyncSkillServiceProtocol, AsyncUserSkillServiceProtocol,
+    AsyncSkillMatchServiceProtocol
+)
+from hashing import HashingBusyError
+from ratelimit import RateLimiter
+from http_cache import catalog_etag, cache_headers, is_not_modified, not_modified_response, payload_response
+from snapshot import CatalogSnapshotStore
+from recommend import RoleRecommender
+from autocomplete import CatalogAutocomplete
+from fuzzy import FuzzySkillSearch
+from templating import create_templates, StaticPageCache
+from fast_json import FastJSONResponse
+
+# Development mode re-reads edited templates and skips the rendered-page cache
+DEBUG = os.getenv("DEBUG", "False").lower() in ("1", "true", "yes")
+
+# Templates, with compiled bytecode cached on disk across restarts
+templates = create_templates(
+    "templates",
+    cache_dir=os.getenv("TEMPLATE_CACHE_DIR", ".template_cache"),
+    auto_reload=DEBUG
+)
+
+# Pages rendered without per-request data, served as cached bytes
+static_pages = StaticPageCache(templates, enabled=not DEBUG)
+
+# Seconds clients may reuse catalog responses before revalidating
+CATALOG_MAX_AGE = int(os.getenv("CATALOG_MAX_AGE", 60))
+
+# Catalog embedded in /job-roles to save a request per role click:
+# "all" roles, the "first" role only, or "off"
+INLINE_CATALOG = os.getenv("INLINE_CATALOG", "off").lower()
+
+# Upper bound on roles in one /api/skills?roles= request
+MAX_ROLES_PER_REQUEST = 100
+
+# Upper bounds for /api/users/search and /api/users/match
+MAX_SEARCH_SKILLS = 20
+MAX_SEARCH_PAGE_SIZE = 100
+
+class SkillSelection(BaseModel):
+    job_role: Optional[str] = None
+    skills: List[str] = Field(default_factory=list, max_length=500)
+
+
+def current_user_id(request: Request) -> int:
+    user_id = request.session.get("user_id")
+    if user_id is None:
+        raise HTTPException(status_code=401, detail="Not logged in")
+    return user_id
+
+
+def parse_skill_names(skills: str) -> List[str]:
+    """Distinct names from a comma-separated ``skills`` query parameter"""
+    skill_names = list(dict.fromkeys(name.strip() for name in skills.split(",") if name.strip()))
+    if not skill_names or len(skill_names) > MAX_SEARCH_SKILLS:
+        raise HTTPException(status_code=400, detail=f"Give between 1 and {MAX_SEARCH_SKILLS} skills")
+    return skill_names
+
+
+def role_contexts(contexts, limit: int) -> List[dict]:
+    return [{"role": role, "category": category} for role, category in contexts[:limit]]
+
+
+def client_ip(request: Request) -> str:
+    return request.client.host if request.client else "unknown"
+
+
+def too_many_attempts(request: Request, retry_after: float):
+    return templates.TemplateResponse("login.html", {
+        "request": request, 
+        "error": "Too many attempts. Please wait a minute and try again."
+    }, status_code=429, headers={"Retry-After": str(int(retry_after) + 1)})
 
-# Templates
-templates = Jinja2Templates(directory="templates")
 
 # Create routers
 auth_router = APIRouter()
 job_router = APIRouter()
-api_router = APIRouter(prefix="/api")
+# API responses are serialized straight to bytes, skipping jsonable_encoder
+api_router = APIRouter(prefix="/api", default_response_class=FastJSONResponse)
 
 
 @auth_router.get("/", response_class=HTMLResponse)
 async def login_page(request: Request):
-    return templates.TemplateResponse("login.html", {"request": request})
+    # Only the error/success variants below render per request
+    return static_pages.response("login.html", request)
 
 
 @auth_router.post("/login")
@@ -28,10 +104,22 @@ async def login(
     userid: str = Form(...),
     password: str = Form(...),
     phone: str = Form(...),
-    user_service: UserServiceProtocol = Depends(Provide[Container.user_service]),
-    db: Session = Depends(get_db)
+    user_service: AsyncUserServiceProtocol = Depends(Provide[Container.async_user_service]),
+    rate_limiter: RateLimiter = Depends(Provide[Container.rate_limiter]),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    user = user_service.authenticate(userid, password, phone, db)
+    # Reject before any hashing or database work
+    retry_after = await rate_limiter.check_login(client_ip(request), userid)
+    if retry_after is not None:
+        return too_many_attempts(request, retry_after)
+    
+    try:
+        user = await user_service.authenticate(userid, password, phone, db)
+    except HashingBusyError:
+        return templates.TemplateResponse("login.html", {
+            "request": request, 
+            "error": "Too many sign-in attempts right now. Please try again shortly."
+        }, status_code=503)
     
     if user:
         # Store user info in session
@@ -54,10 +142,23 @@ async def signup(
     userid: str = Form(...),
     password: str = Form(...),
     phone: str = Form(...),
-    user_service: UserServiceProtocol = Depends(Provide[Container.user_service]),
-    db: Session = Depends(get_db)
+    user_service: AsyncUserServiceProtocol = Depends(Provide[Container.async_user_service]),
+    rate_limiter: RateLimiter = Depends(Provide[Container.rate_limiter]),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    if user_service.create_user(name, userid, password, phone, db):
+    retry_after = await rate_limiter.check_signup(client_ip(request))
+    if retry_after is not None:
+        return too_many_attempts(request, retry_after)
+    
+    try:
+        created = await user_service.create_user(name, userid, password, phone, db)
+    except HashingBusyError:
+        return templates.TemplateResponse("login.html", {
+            "request": request, 
+            "error": "Too many sign-ups right now. Please try again shortly."
+        }, status_code=503)
+    
+    if created:
         return templates.TemplateResponse("login.html", {
             "request": request, 
             "success": "Account created successfully! Please login."
@@ -65,7 +166,7 @@ async def signup(
     else:
         return templates.TemplateResponse("login.html", {
             "request": request, 
-            "error": "User already exists or registration failed"
+            "error": "User ID already exists"
         })
 
 
@@ -79,28 +180,252 @@ async def logout(request: Request):
 @inject
 async def job_roles_page(
     request: Request,
-    skill_service: SkillServiceProtocol = Depends(Provide[Container.skill_service]),
-    db: Session = Depends(get_db)
+    catalog_snapshots: CatalogSnapshotStore = Depends(Provide[Container.catalog_snapshots]),
+    skill_service: AsyncSkillServiceProtocol = Depends(Provide[Container.async_skill_service]),
+    db: AsyncSession = Depends(get_async_db)
 ):
     # Check if user is logged in
     user_name = request.session.get("user_name")
     if not user_name:
         return RedirectResponse(url="/", status_code=303)
     
-    roles = skill_service.get_job_roles(db)
+    roles = await skill_service.get_job_roles(db)
+    
+    # Roles left out are fetched from /api/skills/{role} as before
+    inline_catalog = None
+    snapshot = catalog_snapshots.current
+    if snapshot is not None and roles:
+        if INLINE_CATALOG == "all":
+            inline_catalog = snapshot.inline_skills()
+        elif INLINE_CATALOG == "first":
+            inline_catalog = snapshot.inline_skills(roles[0])
+    
     return templates.TemplateResponse("job_roles.html", {
         "request": request, 
         "roles": roles,
-        "user_name": user_name
+        "user_name": user_name,
+        "inline_catalog": inline_catalog
     })
 
 
+@api_router.get("/roles")
+@inject
+async def get_roles(
+    request: Request,
+    catalog_snapshots: CatalogSnapshotStore = Depends(Provide[Container.catalog_snapshots]),
+    skill_service: AsyncSkillServiceProtocol = Depends(Provide[Container.async_skill_service]),
+    db: AsyncSession = Depends(get_async_db)
+):
+    snapshot = catalog_snapshots.current
+    if snapshot is not None:
+        return payload_response(request, snapshot.roles_payload, skill_service.catalog_updated_at, CATALOG_MAX_AGE)
+    
+    etag = catalog_etag(skill_service.catalog_version, "roles")
+    headers = cache_headers(etag, skill_service.catalog_updated_at, CATALOG_MAX_AGE)
+    if is_not_modified(request, etag, skill_service.catalog_updated_at):
+        return not_modified_response(headers)
+    
+    roles = await skill_service.get_job_roles(db)
+    return FastJSONResponse({"roles": roles}, headers=headers)
+
+
+@api_router.get("/skills")
+@inject
+async def get_skills_for_roles(
+    request: Request,
+    roles: Optional[str] = None,
+    catalog_snapshots: CatalogSnapshotStore = Depends(Provide[Container.catalog_snapshots]),
+    skill_service: AsyncSkillServiceProtocol = Depends(Provide[Container.async_skill_service]),
+    db: AsyncSession = Depends(get_async_db)
+):
+    # Comma-separated role names; omit for every role
+    role_names = None
+    if roles is not None:
+        role_names = [role.strip() for role in roles.split(",") if role.strip()]
+        if len(role_names) > MAX_ROLES_PER_REQUEST:
+            raise HTTPException(status_code=400, detail=f"At most {MAX_ROLES_PER_REQUEST} roles per request")
+    
+    snapshot = catalog_snapshots.current
+    if snapshot is not None:
+        if role_names is None:
+            payload = snapshot.all_skills_payload
+        else:
+            payload = snapshot.skills_for_roles(role_names)
+        return payload_response(request, payload, skill_service.catalog_updated_at, CATALOG_MAX_AGE)
+    
+    skills = await skill_service.get_skills_for_roles(role_names, db)
+    return FastJSONResponse({"skills": skills})
+
+
+@api_router.get("/skills/search")
+@inject
+async def search_catalog(
+    request: Request,
+    prefix: str = Query(..., min_length=1, max_length=100),
+    kind: Optional[str] = Query(None, pattern="^(skill|role)$"),
+    limit: int = Query(10, ge=1, le=MAX_SEARCH_PAGE_SIZE),
+    catalog_autocomplete: CatalogAutocomplete = Depends(Provide[Container.catalog_autocomplete]),
+    skill_service: AsyncSkillServiceProtocol = Depends(Provide[Container.async_skill_service])
+):
+    # Autocomplete from memory; results only change with the catalog version
+    etag = catalog_etag(catalog_autocomplete.version, "search", prefix, kind or "", str(limit))
+    headers = cache_headers(etag, skill_service.catalog_updated_at, CATALOG_MAX_AGE)
+    if is_not_modified(request, etag, skill_service.catalog_updated_at):
+        return not_modified_response(headers)
+    
+    results = [
+        {
+            "name": entry.name,
+            "kind": entry.kind,
+            "contexts": role_contexts(entry.contexts, catalog_autocomplete.max_contexts)
+        }
+        for entry in catalog_autocomplete.search(prefix, limit, kind)
+    ]
+    return FastJSONResponse({"results": results}, headers=headers)
+
+
+@api_router.get("/skills/fuzzy")
+@inject
+async def fuzzy_search_skills(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=MAX_SEARCH_PAGE_SIZE),
+    fuzzy_skill_search: FuzzySkillSearch = Depends(Provide[Container.fuzzy_skill_search]),
+    catalog_autocomplete: CatalogAutocomplete = Depends(Provide[Container.catalog_autocomplete]),
+    skill_service: AsyncSkillServiceProtocol = Depends(Provide[Container.async_skill_service])
+):
+    # Typo-tolerant skill lookup from the in-memory trigram index
+    etag = catalog_etag(fuzzy_skill_search.version, "fuzzy", q, str(limit))
+    headers = cache_headers(etag, skill_service.catalog_updated_at, CATALOG_MAX_AGE)
+    if is_not_modified(request, etag, skill_service.catalog_updated_at):
+        return not_modified_response(headers)
+    
+    results = [
+        {
+            "name": match.name,
+            "distance": match.distance,
+            "contexts": role_contexts(match.contexts, catalog_autocomplete.max_contexts)
+        }
+        for match in fuzzy_skill_search.search(q, limit)
+    ]
+    return FastJSONResponse({"results": results}, headers=headers)
+
+
+@api_router.get("/skills/related")
+@inject
+async def get_related_skills(
+    skills: str,
+    limit: int = Query(10, ge=1, le=MAX_SEARCH_PAGE_SIZE),
+    skill_match_service: AsyncSkillMatchServiceProtocol = Depends(Provide[Container.async_skill_match_service])
+):
+    # "People who picked these also picked": declared before /skills/{role} so it is not read as a role
+    skill_names = parse_skill_names(skills)
+    related = skill_match_service.related_skills(skill_names, limit)
+    return FastJSONResponse({"skills": [{"name": name, "count": count} for name, count in related]})
+
+
 @api_router.get("/skills/{role}")
 @inject
 async def get_skills(
     role: str,
-    skill_service: SkillServiceProtocol = Depends(Provide[Container.skill_service]),
-    db: Session = Depends(get_db)
+    request: Request,
+    catalog_snapshots: CatalogSnapshotStore = Depends(Provide[Container.catalog_snapshots]),
+    skill_service: AsyncSkillServiceProtocol = Depends(Provide[Container.async_skill_service]),
+    db: AsyncSession = Depends(get_async_db)
+):
+    # Serve the pre-encoded bytes; no per-request encoding or lookup
+    snapshot = catalog_snapshots.current
+    if snapshot is not None:
+        return payload_response(request, snapshot.skills(role), skill_service.catalog_updated_at, CATALOG_MAX_AGE)
+    
+    # Until the snapshot is built, answer revalidations from the catalog version alone
+    etag = catalog_etag(skill_service.catalog_version, "skills", role)
+    headers = cache_headers(etag, skill_service.catalog_updated_at, CATALOG_MAX_AGE)
+    if is_not_modified(request, etag, skill_service.catalog_updated_at):
+        return not_modified_response(headers)
+    
+    skills = await skill_service.get_skills_for_role(role, db)
+    return FastJSONResponse({"skills": skills}, headers=headers)
+
+
+@api_router.get("/me/skills")
+@inject
+async def get_my_skills(
+    user_id: int = Depends(current_user_id),
+    user_skill_service: AsyncUserSkillServiceProtocol = Depends(Provide[Container.async_user_skill_service]),
+    db: AsyncSession = Depends(get_async_db)
+):
+    job_role, skills = await user_skill_service.get_selection(user_id, db)
+    return {"job_role": job_role, "skills": skills}
+
+
+@api_router.get("/me/role-recommendations")
+@inject
+async def recommend_roles(
+    metric: str = Query("jaccard", pattern="^(jaccard|cosine)$"),
+    limit: int = Query(5, ge=1, le=MAX_ROLES_PER_REQUEST),
+    user_id: int = Depends(current_user_id),
+    user_skill_service: AsyncUserSkillServiceProtocol = Depends(Provide[Container.async_user_skill_service]),
+    role_recommender: RoleRecommender = Depends(Provide[Container.role_recommender]),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    skills = skill_service.get_skills_for_role(role, db)
-    return {"skills": skills}
\ No newline at end of file
+    _, skills = await user_skill_service.get_selection(user_id, db)
+    return {"roles": [score._asdict() for score in role_recommender.recommend(skills, metric, limit)]}
+
+
+@api_router.put("/me/skills")
+@inject
+async def save_my_skills(
+    selection: SkillSelection,
+    user_id: int = Depends(current_user_id),
+    user_skill_service: AsyncUserSkillServiceProtocol = Depends(Provide[Container.async_user_skill_service]),
+    skill_service: AsyncSkillServiceProtocol = Depends(Provide[Container.async_skill_service]),
+    db: AsyncSession = Depends(get_async_db)
+):
+    if selection.job_role is not None and selection.job_role not in await skill_service.get_job_roles(db):
+        raise HTTPException(status_code=400, detail="Unknown job role")
+    
+    change = await user_skill_service.save_selection(user_id, selection.job_role, selection.skills, db)
+    return {
+        "job_role": change.job_role,
+        "skills": change.skills,
+        "added": change.added,
+        "removed": change.removed
+    }
+
+
+
+@api_router.get("/users/search")
+@inject
+async def search_users(
+    skills: str,
+    match: str = Query("all", pattern="^(all|any)$"),
+    after: int = 0,
+    limit: int = Query(50, ge=1, le=MAX_SEARCH_PAGE_SIZE),
+    user_id: int = Depends(current_user_id),
+    user_skill_service: AsyncUserSkillServiceProtocol = Depends(Provide[Container.async_user_skill_service]),
+    db: AsyncSession = Depends(get_async_db)
+):
+    # Pass next_after back as `after` for the next page
+    skill_names = parse_skill_names(skills)
+    users, next_after = await user_skill_service.search_users(skill_names, match == "all", after, limit, db)
+    return FastJSONResponse({"users": [user._asdict() for user in users], "next_after": next_after})
+
+
+@api_router.get("/users/match")
+@inject
+async def match_users(
+    skills: str,
+    min_overlap: int = Query(1, ge=1),
+    limit: int = Query(20, ge=1, le=MAX_SEARCH_PAGE_SIZE),
+    user_id: int = Depends(current_user_id),
+    skill_match_service: AsyncSkillMatchServiceProtocol = Depends(Provide[Container.async_skill_match_service]),
+    db: AsyncSession = Depends(get_async_db)
+):
+    # Ranked by how many of the skills each user holds, from the in-memory skill index
+    skill_names = parse_skill_names(skills)
+    matches, total = await skill_match_service.match(skill_names, min_overlap, limit, db)
+    return FastJSONResponse({
+        "users": [{**user._asdict(), "matched": overlap} for user, overlap in matches],
+        "total": total
+    })
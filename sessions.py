@@ -0,0 +1,208 @@
+import asyncio
+import json
+import secrets
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Protocol, Sequence, Tuple
+
+from starlette.datastructures import MutableHeaders
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class SessionBackend(Protocol):
+    async def load(self, session_id: str) -> Optional[Dict[str, Any]]:
+        ...
+
+    async def save(self, session_id: str, data: Dict[str, Any], max_age: int) -> None:
+        ...
+
+    async def delete(self, session_id: str) -> None:
+        ...
+
+
+class MemorySessionBackend:
+    """Sessions in process memory, evicting the least recently used beyond ``max_entries``"""
+
+    def __init__(self, max_entries: int = 100_000):
+        self.max_entries = max_entries
+        self._sessions: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+    async def load(self, session_id: str) -> Optional[Dict[str, Any]]:
+        entry = self._sessions.get(session_id)
+        if entry is None:
+            return None
+        expires, data = entry
+        if expires < time.time():
+            del self._sessions[session_id]
+            return None
+        self._sessions.move_to_end(session_id)
+        return dict(data)
+
+    async def save(self, session_id: str, data: Dict[str, Any], max_age: int) -> None:
+        self._sessions[session_id] = (time.time() + max_age, dict(data))
+        self._sessions.move_to_end(session_id)
+        while len(self._sessions) > self.max_entries:
+            self._sessions.popitem(last=False)
+
+    async def delete(self, session_id: str) -> None:
+        self._sessions.pop(session_id, None)
+
+
+class SQLiteSessionBackend:
+    """Sessions in a local SQLite file, shared by every worker on the host"""
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS sessions (id TEXT PRIMARY KEY, data TEXT NOT NULL, expires REAL NOT NULL)"
+        )
+
+    def _load(self, session_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT data FROM sessions WHERE id = ? AND expires >= ?", (session_id, time.time())
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _save(self, session_id: str, data: Dict[str, Any], max_age: int) -> None:
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO sessions (id, data, expires) VALUES (?, ?, ?)",
+                (session_id, json.dumps(data), now + max_age),
+            )
+            # Writes are rare (login/logout), so purging here keeps the table small
+            self._connection.execute("DELETE FROM sessions WHERE expires < ?", (now,))
+
+    def _delete(self, session_id: str) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+
+    async def load(self, session_id: str) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self._load, session_id)
+
+    async def save(self, session_id: str, data: Dict[str, Any], max_age: int) -> None:
+        await asyncio.to_thread(self._save, session_id, data, max_age)
+
+    async def delete(self, session_id: str) -> None:
+        await asyncio.to_thread(self._delete, session_id)
+
+
+class RedisSessionBackend:
+    """Sessions in a Redis-protocol store; ``client`` is any ``redis.asyncio``-compatible client"""
+
+    def __init__(self, client, prefix: str = "session:"):
+        self._client = client
+        self._prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisSessionBackend":
+        import redis.asyncio as redis
+        return cls(redis.from_url(url))
+
+    async def load(self, session_id: str) -> Optional[Dict[str, Any]]:
+        value = await self._client.get(self._prefix + session_id)
+        return json.loads(value) if value else None
+
+    async def save(self, session_id: str, data: Dict[str, Any], max_age: int) -> None:
+        await self._client.set(self._prefix + session_id, json.dumps(data), ex=max_age)
+
+    async def delete(self, session_id: str) -> None:
+        await self._client.delete(self._prefix + session_id)
+
+
+class TrackedSession(dict):
+    """Session dict that remembers whether a handler changed it"""
+
+    modified = False
+
+    def __setitem__(self, key, value):
+        self.modified = True
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self.modified = True
+        super().__delitem__(key)
+
+    def clear(self):
+        self.modified = True
+        super().clear()
+
+    def pop(self, *args):
+        self.modified = True
+        return super().pop(*args)
+
+    def popitem(self):
+        self.modified = True
+        return super().popitem()
+
+    def setdefault(self, key, default=None):
+        self.modified = True
+        return super().setdefault(key, default)
+
+    def update(self, *args, **kwargs):
+        self.modified = True
+        super().update(*args, **kwargs)
+
+
+class ServerSideSessionMiddleware:
+    """Keeps session data in a backend; the cookie only carries a random opaque ID.
+
+    Paths under ``exclude_paths`` never read the session. Elsewhere the backend is
+    written, and the cookie set, only when a handler modifies the session.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        backend: SessionBackend,
+        session_cookie: str = "sid",
+        max_age: int = 14 * 24 * 60 * 60,
+        path: str = "/",
+        same_site: str = "lax",
+        https_only: bool = False,
+        exclude_paths: Sequence[str] = ("/static", "/health"),
+    ):
+        self.app = app
+        self.backend = backend
+        self.session_cookie = session_cookie
+        self.max_age = max_age
+        self.path = path
+        self.exclude_paths = tuple(exclude_paths)
+        self.security_flags = "httponly; samesite=" + same_site
+        if https_only:
+            self.security_flags += "; secure"
+
+    def _cookie(self, value: str, max_age: int) -> str:
+        return f"{self.session_cookie}={value}; path={self.path}; Max-Age={max_age}; {self.security_flags}"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] not in ("http", "websocket") or scope["path"].startswith(self.exclude_paths):
+            await self.app(scope, receive, send)
+            return
+
+        session_id = HTTPConnection(scope).cookies.get(self.session_cookie)
+        data = await self.backend.load(session_id) if session_id else None
+        session = TrackedSession(data or {})
+        scope["session"] = session
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and session.modified:
+                headers = MutableHeaders(scope=message)
+                if data is not None:
+                    await self.backend.delete(session_id)
+                if session:
+                    # A fresh ID on every change, so a login never reuses a pre-login ID
+                    new_id = secrets.token_urlsafe(16)
+                    await self.backend.save(new_id, dict(session), self.max_age)
+                    headers.append("Set-Cookie", self._cookie(new_id, self.max_age))
+                elif session_id:
+                    headers.append("Set-Cookie", self._cookie("null", 0))
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
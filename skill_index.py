@@ -0,0 +1,90 @@
+import heapq
+from bisect import bisect_left, insort
+from collections import Counter
+from itertools import chain
+from typing import Dict, Iterable, List, Optional, Protocol, Set, Tuple
+
+
+class SkillSelectionListener(Protocol):
+    def on_selection_change(self, user_id: int, skills: List[str], added: List[str], removed: List[str]) -> None:
+        """Called after a save with the user's full skill list and what changed"""
+        ...
+
+
+class SkillIndex:
+    """Inverted index from skill name to the sorted ids of users holding it.
+
+    Skills are keyed by name, the identity users select; the same name under
+    several roles shares one posting list. Saves update it in place through
+    ``on_selection_change``. A full rebuild is made with ``collect`` and
+    ``build``, which touch no shared state and so can run in worker threads;
+    ``install`` swaps it in, replaying any changes that arrived while the
+    rebuild was reading the database.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, List[int]] = {}
+        self._replay: Optional[List[Tuple[int, List[str], List[str]]]] = None
+        self.loaded = False
+
+    def begin_rebuild(self) -> None:
+        self._replay = []
+
+    def cancel_rebuild(self) -> None:
+        self._replay = None
+
+    @staticmethod
+    def collect(users_by_name: Dict[str, Set[int]], rows: Iterable[Tuple[int, str]]) -> None:
+        """Add a batch of ``(user_id, skill name)`` rows to a rebuild in progress"""
+        for user_id, name in rows:
+            users_by_name.setdefault(name, set()).add(user_id)
+
+    @staticmethod
+    def build(users_by_name: Dict[str, Set[int]]) -> Dict[str, List[int]]:
+        return {name: sorted(users) for name, users in users_by_name.items()}
+
+    def install(self, postings: Dict[str, List[int]]) -> None:
+        """Swap in the result of ``build``, replaying saves made since ``begin_rebuild``"""
+        self._postings = postings
+        # Applying a change the rows already reflect is a no-op, so replaying everything is safe
+        replay, self._replay = self._replay or [], None
+        for user_id, added, removed in replay:
+            self._apply(user_id, added, removed)
+        self.loaded = True
+
+    def on_selection_change(self, user_id: int, skills: List[str], added: List[str], removed: List[str]) -> None:
+        if self._replay is not None:
+            self._replay.append((user_id, added, removed))
+        self._apply(user_id, added, removed)
+
+    def _apply(self, user_id: int, added: List[str], removed: List[str]) -> None:
+        for name in added:
+            users = self._postings.setdefault(name, [])
+            position = bisect_left(users, user_id)
+            if position == len(users) or users[position] != user_id:
+                insort(users, user_id, position)
+        for name in removed:
+            users = self._postings.get(name)
+            if users:
+                position = bisect_left(users, user_id)
+                if position < len(users) and users[position] == user_id:
+                    del users[position]
+
+    def users_with(self, name: str) -> List[int]:
+        return self._postings.get(name, [])
+
+    def overlap_counts(self, names: List[str]) -> Counter:
+        """How many of ``names`` each user holds, for users holding at least one"""
+        return Counter(chain.from_iterable(self.users_with(name) for name in dict.fromkeys(names)))
+
+    def top_k(self, names: List[str], k: int, threshold: int = 1) -> Tuple[List[Tuple[int, int]], int]:
+        """The ``k`` users holding the most of ``names`` (ties by lowest id) and how many qualified"""
+        counts = [(user_id, count) for user_id, count in self.overlap_counts(names).items() if count >= threshold]
+        return heapq.nsmallest(k, counts, key=lambda item: (-item[1], item[0])), len(counts)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "loaded": self.loaded,
+            "skills": len(self._postings),
+            "postings": sum(len(users) for users in self._postings.values()),
+        }
@@ -0,0 +1,98 @@
+import gzip
+import hashlib
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+
+def encode_json(content: Any) -> bytes:
+    # Same separators and escaping as FastAPI's JSONResponse
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def script_safe(body: bytes) -> str:
+    """Encoded JSON that can sit inside a <script> element.
+
+    ``<`` only occurs inside JSON strings, where ``\\u003c`` decodes to the same
+    text, so neither ``</script>`` nor ``<!--`` can end or alter the element.
+    """
+    return body.replace(b"<", b"\\u003c").decode("utf-8")
+
+
+class EncodedPayload:
+    """A JSON body serialized once, with an optional gzip variant and their ETags"""
+
+    __slots__ = ("body", "etag", "gzip_body", "gzip_etag")
+
+    def __init__(self, body: bytes, gzip_min_size: Optional[int] = None):
+        digest = hashlib.sha256(body).hexdigest()[:20]
+        self.body = body
+        self.etag = f'"{digest}"'
+        self.gzip_body: Optional[bytes] = None
+        self.gzip_etag: Optional[str] = None
+        if gzip_min_size is not None and len(body) >= gzip_min_size:
+            # mtime=0 keeps the compressed bytes identical across rebuilds and processes
+            self.gzip_body = gzip.compress(body, compresslevel=9, mtime=0)
+            self.gzip_etag = f'"{digest}-gz"'
+
+    @classmethod
+    def from_content(cls, content: Any, gzip_min_size: Optional[int] = None) -> "EncodedPayload":
+        return cls(encode_json(content), gzip_min_size)
+
+
+class CatalogSnapshot:
+    """The whole role -> category -> skills catalog as pre-encoded API responses"""
+
+    def __init__(
+        self,
+        version: str,
+        roles: List[str],
+        rows: List[Tuple[str, str, str]],
+        gzip_min_size: Optional[int] = None,
+    ):
+        skills_by_role: Dict[str, Dict[str, List[str]]] = {role: {} for role in roles}
+        for role, category, name in rows:
+            skills_by_role.setdefault(role, {}).setdefault(category, []).append(name)
+
+        self.version = version
+        self.roles_payload = EncodedPayload.from_content({"roles": roles}, gzip_min_size)
+        self.empty_skills_payload = EncodedPayload.from_content({"skills": {}})
+        self.skills_payloads = {
+            role: EncodedPayload.from_content({"skills": skills}, gzip_min_size)
+            for role, skills in skills_by_role.items()
+        }
+        self.all_skills_payload = EncodedPayload.from_content({"skills": skills_by_role}, gzip_min_size)
+        # Encoded "role":{...} members, spliced together for multi-role requests
+        self._skills_members = {
+            role: encode_json(role) + b":" + encode_json(skills)
+            for role, skills in skills_by_role.items()
+        }
+        self._inline: Dict[Optional[str], str] = {}
+
+    def skills(self, role: str) -> EncodedPayload:
+        return self.skills_payloads.get(role, self.empty_skills_payload)
+
+    def inline_skills(self, role: Optional[str] = None) -> str:
+        """Script-safe ``{"skills": {role: ...}}`` for one role, or every role when None"""
+        inline = self._inline.get(role)
+        if inline is None:
+            payload = self.all_skills_payload if role is None else self.skills_for_roles([role])
+            inline = self._inline[role] = script_safe(payload.body)
+        return inline
+
+    def skills_for_roles(self, roles: List[str]) -> EncodedPayload:
+        members = [
+            self._skills_members.get(role) or encode_json(role) + b":{}"
+            for role in dict.fromkeys(roles)
+        ]
+        return EncodedPayload(b'{"skills":{' + b",".join(members) + b"}}")
+
+
+class CatalogSnapshotStore:
+    """Holds the current snapshot; rebuilt by CatalogCache only when the catalog version changes"""
+
+    def __init__(self, gzip_min_size: Optional[int] = None):
+        self.gzip_min_size = gzip_min_size
+        self.current: Optional[CatalogSnapshot] = None
+
+    def on_catalog_change(self, version: str, roles: List[str], rows: List[Tuple[str, str, str]]) -> None:
+        self.current = CatalogSnapshot(version, roles, rows, self.gzip_min_size)
@@ -72,35 +72,160 @@ document.addEventListener('DOMContentLoaded', function() {
     const selectedRoleName = document.getElementById('selectedRoleName');
     const selectedSkillsContainer = document.getElementById('selectedSkills');
     const clearBtn = document.getElementById('clearBtn');
+    const suggestedSkillsSection = document.getElementById('suggestedSkillsSection');
+    const suggestedSkillsContainer = document.getElementById('suggestedSkills');
     
     let selectedSkills = new Set();
     let currentRole = null;
     
+    // Skills the server embedded in the page, by role; other roles are fetched
+    const catalogData = document.getElementById('catalogData');
+    const inlinedSkills = catalogData ? JSON.parse(catalogData.textContent).skills : {};
+    
+    // Batched autosave: changes are collected and sent as one request
+    const SAVE_DELAY_MS = 800;
+    let saveTimer = null;
+    let pendingSave = Promise.resolve();
+    
     // Handle job role selection
     jobRoleBtns.forEach(btn => {
         btn.addEventListener('click', function() {
-            // Remove active class from all buttons
-            jobRoleBtns.forEach(b => b.classList.remove('active'));
-            
-            // Add active class to clicked button
-            this.classList.add('active');
+            selectRole(this);
+            scheduleSave();
+        });
+    });
+    
+    function selectRole(btn) {
+        // Remove active class from all buttons
+        jobRoleBtns.forEach(b => b.classList.remove('active'));
+        
+        // Add active class to clicked button
+        btn.classList.add('active');
+        
+        const role = btn.dataset.role;
+        currentRole = role;
+        
+        // Update the selected role name
+        selectedRoleName.textContent = role;
+        
+        // Fetch skills for this role
+        fetchSkillsForRole(role);
+    }
+    
+    // Restore the saved role and skills
+    async function loadSavedSelection() {
+        try {
+            const response = await fetch('/api/me/skills');
+            if (!response.ok) {
+                return;
+            }
+            const data = await response.json();
             
-            const role = this.dataset.role;
-            currentRole = role;
+            data.skills.forEach(skill => selectedSkills.add(skill));
+            renderSelectedSkills();
+            loadSuggestions();
             
-            // Update the selected role name
-            selectedRoleName.textContent = role;
+            const roleBtn = Array.from(jobRoleBtns).find(btn => btn.dataset.role === data.job_role);
+            if (roleBtn) {
+                selectRole(roleBtn);
+            } else if (selectedSkills.size > 0) {
+                skillsSection.style.display = 'block';
+            }
+        } catch (error) {
+            console.error('Error loading saved skills:', error);
+        }
+    }
+    
+    // Debounce saves so a burst of clicks becomes one request
+    function scheduleSave() {
+        clearTimeout(saveTimer);
+        saveTimer = setTimeout(saveSelection, SAVE_DELAY_MS);
+    }
+    
+    function saveSelection(keepalive = false) {
+        clearTimeout(saveTimer);
+        saveTimer = null;
+        // One save in flight at a time; the next sends the selection as it is once the previous finishes
+        pendingSave = pendingSave.then(() => putSelection(keepalive));
+        return pendingSave;
+    }
+    
+    async function putSelection(keepalive) {
+        try {
+            await fetch('/api/me/skills', {
+                method: 'PUT',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ job_role: currentRole, skills: Array.from(selectedSkills) }),
+                keepalive: keepalive
+            });
+        } catch (error) {
+            console.error('Error saving skills:', error);
+        }
+        if (!keepalive) {
+            loadSuggestions();
+        }
+    }
+    
+    // Suggest skills often picked together with the current selection
+    async function loadSuggestions() {
+        suggestedSkillsContainer.innerHTML = '';
+        suggestedSkillsSection.style.display = 'none';
+        if (selectedSkills.size === 0) {
+            return;
+        }
+        try {
+            const params = new URLSearchParams({ skills: Array.from(selectedSkills).join(','), limit: 8 });
+            const response = await fetch(`/api/skills/related?${params}`);
+            if (!response.ok) {
+                return;
+            }
+            const data = await response.json();
             
-            // Fetch skills for this role
-            fetchSkillsForRole(role);
-        });
+            data.skills.forEach(({ name }) => {
+                const badge = document.createElement('span');
+                badge.className = 'skill-badge-item';
+                badge.textContent = name;
+                badge.style.cursor = 'pointer';
+                badge.addEventListener('click', function() {
+                    addSkill(name);
+                    this.remove();
+                    
+                    // Mark the skill in the role's list too, if it is shown
+                    const skillBadge = skillsContainer.querySelector(`[data-skill="${name}"]`);
+                    if (skillBadge) {
+                        skillBadge.classList.add('selected');
+                        skillBadge.style.cursor = 'default';
+                    }
+                });
+                suggestedSkillsContainer.appendChild(badge);
+            });
+            suggestedSkillsSection.style.display = data.skills.length > 0 ? 'block' : 'none';
+        } catch (error) {
+            console.error('Error loading suggested skills:', error);
+        }
+    }
+    
+    // Flush a pending save when the page is hidden or closed
+    document.addEventListener('visibilitychange', function() {
+        if (document.visibilityState === 'hidden' && saveTimer !== null) {
+            saveSelection(true);
+        }
     });
     
+    if (jobRoleBtns.length > 0) {
+        loadSavedSelection();
+    }
+    
     // Fetch skills from API
     async function fetchSkillsForRole(role) {
         try {
-            const response = await fetch(`/api/skills/${encodeURIComponent(role)}`);
-            const data = await response.json();
+            let data;
+            if (Object.prototype.hasOwnProperty.call(inlinedSkills, role)) {
+                data = { skills: inlinedSkills[role] };
+            } else {
+                const response = await fetch(`/api/skills/${encodeURIComponent(role)}`);
+                data = await response.json();
+            }
             
             // Clear existing skills
             skillsContainer.innerHTML = '';
@@ -137,6 +262,12 @@ document.addEventListener('DOMContentLoaded', function() {
                     skillBadge.textContent = skill;
                     skillBadge.style.cursor = 'pointer';
                     
+                    // Mark skills that are already selected
+                    if (selectedSkills.has(skill)) {
+                        skillBadge.classList.add('selected');
+                        skillBadge.style.cursor = 'default';
+                    }
+                    
                     // Add click handler
                     skillBadge.addEventListener('click', function() {
                         if (!selectedSkills.has(skill)) {
@@ -171,6 +302,7 @@ document.addEventListener('DOMContentLoaded', function() {
         if (!selectedSkills.has(skill)) {
             selectedSkills.add(skill);
             renderSelectedSkills();
+            scheduleSave();
         }
     }
     
@@ -178,6 +310,7 @@ document.addEventListener('DOMContentLoaded', function() {
     function removeSkill(skill) {
         selectedSkills.delete(skill);
         renderSelectedSkills();
+        scheduleSave();
         
         // Reset the skill badge state
         const skillBadge = skillsContainer.querySelector(`[data-skill="${skill}"]`);
@@ -230,6 +363,7 @@ document.addEventListener('DOMContentLoaded', function() {
             skillsSection.style.display = 'none';
             
             currentRole = null;
+            scheduleSave();
         });
     }
 });
\ No newline at end of file
@@ -0,0 +1,56 @@
+import os
+from typing import Any, Dict
+
+from fastapi import Request
+from fastapi.responses import HTMLResponse
+from fastapi.templating import Jinja2Templates
+from jinja2 import FileSystemBytecodeCache
+
+from cache import LRUCache, MISSING
+
+
+def create_templates(directory: str, cache_dir: str, auto_reload: bool) -> Jinja2Templates:
+    """Jinja2 templates whose compiled bytecode is kept in ``cache_dir`` across restarts"""
+    os.makedirs(cache_dir, exist_ok=True)
+    return Jinja2Templates(
+        directory=directory,
+        bytecode_cache=FileSystemBytecodeCache(cache_dir),
+        # Without auto-reload Jinja never stats template files after the first load
+        auto_reload=auto_reload,
+    )
+
+
+def precompile(templates: Jinja2Templates) -> int:
+    """Compile every template up front so no request pays for parsing; returns how many"""
+    names = templates.env.list_templates(extensions=["html"])
+    for name in names:
+        templates.get_template(name)
+    return len(names)
+
+
+class StaticPageCache:
+    """Rendered bytes of pages whose output does not depend on the request.
+
+    Templates link to assets through ``static_url``, which emits relative paths,
+    so one entry per page serves every Host.
+    """
+
+    def __init__(self, templates: Jinja2Templates, enabled: bool = True, max_entries: int = 64):
+        self._templates = templates
+        self.enabled = enabled
+        self._pages = LRUCache(max_entries=max_entries)
+
+    def response(self, name: str, request: Request) -> HTMLResponse:
+        if not self.enabled:
+            return self._templates.TemplateResponse(name, {"request": request})
+        body = self._pages.get(name)
+        if body is MISSING:
+            body = self._templates.TemplateResponse(name, {"request": request}).body
+            self._pages.set(name, body)
+        return HTMLResponse(body)
+
+    def clear(self) -> None:
+        self._pages.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"enabled": self.enabled, **self._pages.stats()}